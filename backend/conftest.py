@@ -0,0 +1,32 @@
+import os
+
+import pytest
+
+# With pytest-xdist every worker gets its own MongoDB database, Redis db and trip_goals table, so the
+# per-test cleanup of one worker does not wipe the data of another. This runs before
+# test_main imports main, which reads these variables when it connects.
+worker_id = os.environ.get("PYTEST_XDIST_WORKER")
+if worker_id:
+    worker_number = int(worker_id.removeprefix("gw"))
+    os.environ["MONGO_DB"] = f"mydatabase_test_{worker_id}"
+    # The worker's own trip_goals table lives in this PostgreSQL schema, the other tables stay shared in public
+    os.environ["PG_SCHEMA"] = f"test_{worker_id}"
+    # Redis has 16 databases, 0 is left for the app, so at most 15 workers
+    os.environ["REDIS_DB"] = str(1 + worker_number)
+
+# The cost of a bcrypt hash is stored in the hash, so with the minimum cost the test users
+# created through /signup are also checked cheaply on /login
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+def pytest_addoption(parser):
+    parser.addoption("--run-benchmarks", action="store_true", default=False,
+                     help="also run the tests marked with benchmark, they are skipped by default")
+
+# The benchmarks run a hundred rounds or more each, so the normal suite skips them
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-benchmarks"):
+        return
+    skip_benchmark = pytest.mark.skip(reason="benchmark, run with --run-benchmarks")
+    for item in items:
+        if item.get_closest_marker("benchmark"):
+            item.add_marker(skip_benchmark)
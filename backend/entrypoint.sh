@@ -24,4 +24,5 @@ wait_for_postgres
 pytest --cov=main --cov-report=xml --junitxml=test-results.xml
 
 # Keep the container running
-exec gunicorn -w 4 -b 0.0.0.0:8000 main:app
\ No newline at end of file
+# gevent workers; worker-connections matches the PostgreSQL pool maxconn in main.py
+exec gunicorn -k gevent -w 4 --worker-connections 50 -b 0.0.0.0:8000 main:app
\ No newline at end of file
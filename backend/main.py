@@ -1,57 +1,467 @@
-from flask import Flask, jsonify, request
-import psycopg2
+# Parchear la librería estándar para gevent antes de importar los drivers de bases de datos
+import gevent
+from gevent import monkey
+monkey.patch_all()
+from psycogreen.gevent import patch_psycopg
+patch_psycopg()
+
+from contextlib import contextmanager
+from itertools import chain
+import hmac
+import os
+import secrets
+import bcrypt
+from flask import Flask, g, jsonify, request
+from flask.json.provider import JSONProvider
+import orjson
 from psycopg2 import OperationalError
-from pymongo import MongoClient
+from psycopg2.extensions import connection as PGConnection
+from psycopg2.pool import ThreadedConnectionPool
+from pymongo import MongoClient, ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
 import redis
 from tenacity import retry, wait_fixed, stop_after_delay
 
+# Serializar JSON con orjson (implementado en Rust) en lugar del módulo json de la librería estándar
+class ORJSONProvider(JSONProvider):
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj).decode("utf-8")
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj), mimetype="application/json")
+
 app = Flask(__name__)
+app.json = ORJSONProvider(app)
 
 # Reacciones válidas
 REACTIONS = ["like", "love", "haha", "wow", "sad", "angry"]
 
 X = 2  # Cantidad de reacciones para cachear un post
 
+LIST_CACHE_TTL = 30  # Segundos que se cachean los listados de posts y destinos en Redis
+USERNAME_CACHE_TTL = 3600  # Segundos que se cachea el nombre de usuario en Redis
+POST_CACHE_TTL = 86400  # Segundos que se cachea cada post popular en Redis
+POST_NOT_FOUND_TTL = 60  # Segundos que se recuerda en Redis que un post no existe
+POST_NOT_FOUND = b"\x00NULL"  # Valor que marca en Redis un post que no existe
+TRIP_GOAL_CACHE_TTL = 86400  # Segundos que se cachea cada trip goal en Redis
+LIST_BATCH_SIZE = 1000  # Documentos por batch al leer colecciones completas de MongoDB
+
+# Base de datos de MongoDB y de Redis, se pueden cambiar para que los tests en paralelo no compartan datos
+MONGO_DB_NAME = os.environ.get("MONGO_DB", "mydatabase")
+REDIS_DB = int(os.environ.get("REDIS_DB", "0"))
+
+# Esquema de PostgreSQL con tablas propias, los tests en paralelo lo usan para no compartir trip_goals (ver conftest.py)
+PG_SCHEMA = os.environ.get("PG_SCHEMA")
+
+# Factor de trabajo para el hash de contraseñas, los tests lo bajan para que signup y login no gasten CPU
+BCRYPT_ROUNDS = int(os.environ.get("BCRYPT_ROUNDS", "12"))
+
+# Sentencias preparadas una vez por conexión para no parsear y planear las consultas frecuentes en cada request
+PREPARED_STATEMENTS = {
+    "get_username": "SELECT username FROM users WHERE sub = $1",
+    "get_user_credentials": "SELECT sub, password FROM users WHERE username = $1",
+    "insert_user": "INSERT INTO users (username, password) VALUES ($1, $2) RETURNING sub",
+    "update_password": "UPDATE users SET password = $1 WHERE sub = $2",
+    "insert_post": "INSERT INTO posts (sub) VALUES ($1) RETURNING post_id, (SELECT username FROM users WHERE sub = $1)",
+    "follow_trip_goal": "INSERT INTO trip_goals (trip_goal_id, sub) VALUES ($1, $2) ON CONFLICT (sub, trip_goal_id) DO NOTHING",
+    "unfollow_trip_goal": "DELETE FROM trip_goals WHERE trip_goal_id = $1 AND sub = $2",
+    "get_followed_trip_goals": "SELECT trip_goal_id FROM trip_goals WHERE sub = $1",
+}
+
+# Conexión que recuerda si ya se prepararon las sentencias
+class PreparedConnection(PGConnection):
+    prepared = False
+
 # Configuración de PostgreSQL con reintentos
+# Se usa un pool de conexiones para que cada request tenga su propia conexión
+# maxconn debe coincidir con --worker-connections de gunicorn (entrypoint.sh)
 @retry(wait=wait_fixed(2), stop=stop_after_delay(30))
 def connect_to_postgres():
-    return psycopg2.connect(
+    return ThreadedConnectionPool(
+        minconn=5,
+        maxconn=50,
         dbname="mydatabase",
         user="myuser",
         password="mypassword",
-        host="db"
+        host="db",
+        connection_factory=PreparedConnection,
+        # Las tablas que no estén en PG_SCHEMA se siguen resolviendo en public
+        options=f"-c search_path={PG_SCHEMA},public" if PG_SCHEMA else None
     )
 
 try:
-    pg_conn = connect_to_postgres()
+    pg_pool = connect_to_postgres()
 except OperationalError as e:
     print(f"Error connecting to PostgreSQL: {e}")
 
+# Obtener una conexión del pool, hace commit al terminar o rollback si hay error
+@contextmanager
+def get_pg():
+    conn = pg_pool.getconn()
+    if not conn.prepared:
+        try:
+            # Se hace commit para que un rollback posterior no deshaga los PREPARE
+            with conn.cursor() as cursor:
+                for name, statement in PREPARED_STATEMENTS.items():
+                    cursor.execute(f"PREPARE {name} AS {statement}")
+            conn.commit()
+        except Exception:
+            # Una conexión a medio preparar se cierra al devolverla, así el pool no pierde la conexión ni la reutiliza
+            pg_pool.putconn(conn, close=True)
+            raise
+        conn.prepared = True
+    try:
+        yield conn
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        pg_pool.putconn(conn)
+
+# Obtener un cursor sobre una conexión del pool, se cierra y se hace commit al salir
+@contextmanager
+def pg_cursor():
+    with get_pg() as conn, conn.cursor() as cursor:
+        yield cursor
+
+# Crear PG_SCHEMA con su propia tabla trip_goals, antes de preparar sentencias que la usen. El índice único
+# lo crea ensure_trip_goals_unique_index igual que en public
+def ensure_pg_schema():
+    conn = pg_pool.getconn()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {PG_SCHEMA}")
+            cursor.execute(f"CREATE TABLE IF NOT EXISTS {PG_SCHEMA}.trip_goals (LIKE public.trip_goals INCLUDING DEFAULTS)")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        pg_pool.putconn(conn)
+
+if PG_SCHEMA:
+    try:
+        ensure_pg_schema()
+    except Exception as e:
+        print(f"Error creating the PostgreSQL schema {PG_SCHEMA}: {e}")
+
+# Índice único que usa ON CONFLICT en follow_trip_goal, init-postgres.sql solo corre con un volumen nuevo
+# así que en bases existentes se crea al iniciar, quitando antes los seguimientos duplicados que lo impedirían.
+# Se usa una conexión sin PREPARE porque preparar follow_trip_goal falla mientras el índice no exista,
+# y un advisory lock para que los workers de gunicorn no lo creen a la vez
+def ensure_trip_goals_unique_index():
+    conn = pg_pool.getconn()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(hashtext('idx_trip_goals_sub_trip_goal_id'))")
+            cursor.execute("""
+                DELETE FROM trip_goals a USING trip_goals b
+                WHERE a.sub = b.sub AND a.trip_goal_id = b.trip_goal_id AND a.ctid > b.ctid
+            """)
+            cursor.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_trip_goals_sub_trip_goal_id ON trip_goals(sub, trip_goal_id)")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        pg_pool.putconn(conn)
+
+try:
+    ensure_trip_goals_unique_index()
+except Exception as e:
+    print(f"Error creating the trip_goals unique index: {e}")
+
+# La columna password pasó de VARCHAR(50) a VARCHAR(60) para guardar hashes bcrypt, init-postgres.sql solo corre
+# con un volumen nuevo así que en bases existentes se amplía al iniciar. Las contraseñas en texto plano que ya
+# existan se rehashean en el siguiente login (ver login)
+def ensure_users_password_column():
+    conn = pg_pool.getconn()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT pg_advisory_xact_lock(hashtext('users_password_varchar_60'))")
+            cursor.execute("""
+                SELECT character_maximum_length FROM information_schema.columns
+                WHERE table_name = 'users' AND column_name = 'password'
+            """)
+            row = cursor.fetchone()
+            if row and row[0] is not None and row[0] < 60:
+                cursor.execute("ALTER TABLE users ALTER COLUMN password TYPE VARCHAR(60)")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        pg_pool.putconn(conn)
+
+try:
+    ensure_users_password_column()
+except Exception as e:
+    print(f"Error migrating the users password column: {e}")
+
 # Configuración de MongoDB
 try:
-    mongo_client = MongoClient("mongodb://mongo:27017/")
-    mongo_db = mongo_client["mydatabase"]
+    # Compresión zstd en el protocolo para reducir los bytes de los documentos con muchos comentarios y reacciones
+    mongo_client = MongoClient("mongodb://mongo:27017/", compressors="zstd")
+    mongo_db = mongo_client[MONGO_DB_NAME]
+
+    # Colecciones, se obtienen una sola vez al iniciar
+    POSTS = mongo_db["posts"]
+    DESTINATIONS = mongo_db["destinations"]
+    TRIP_GOALS = mongo_db["tripGoals"]
+    COUNTERS = mongo_db["counters"]
 except Exception as e:
     print(f"Error connecting to MongoDB: {e}")
 
+# Índices para las búsquedas por id, por comentario y por nombre de destino
+# El id de los posts viene del serial de PostgreSQL, así que nunca se repite y puede ser único
+# Cada índice se crea por separado, un índice único que falle por datos duplicados no impide crear los demás
+def ensure_mongo_indexes():
+    indexes = [
+        (POSTS, "id", {"unique": True}),
+        (POSTS, "comments.comment_id", {}),
+        (DESTINATIONS, "id", {"unique": True}),
+        (DESTINATIONS, "name", {"unique": True}),
+        (TRIP_GOALS, "id", {"unique": True}),
+        (TRIP_GOALS, "user_id", {}),
+        (TRIP_GOALS, [("id", 1), ("followers.user_id", 1)], {}),
+    ]
+    for collection, keys, options in indexes:
+        try:
+            collection.create_index(keys, **options)
+        except Exception as e:
+            print(f"Error creating the {keys} index on {collection.name}: {e}")
+
+try:
+    ensure_mongo_indexes()
+except Exception as e:
+    print(f"Error creating the MongoDB indexes: {e}")
+
+# Operación que sube un contador de ids al mayor id de su colección, o None si la colección está vacía
+def counter_sync_operation(name, collection):
+    last = collection.find_one({}, {"_id": 0, "id": 1}, sort=[("id", -1)])
+    if last:
+        return UpdateOne({"_id": name}, {"$max": {"seq": last["id"]}}, upsert=True)
+    return None
+
+# Alinear los contadores con el mayor id existente, init-mongo.js solo los siembra con un volumen nuevo.
+# $max nunca los hace retroceder, así que es seguro correrlo en cada worker al iniciar
+def sync_counters():
+    operations = []
+    for name, collection in (("destinations", DESTINATIONS), ("tripGoals", TRIP_GOALS)):
+        operation = counter_sync_operation(name, collection)
+        if operation:
+            operations.append(operation)
+
+    # Un contador de comentarios por post y por destino con comentarios
+    for prefix, collection in (("posts", POSTS), ("destinations", DESTINATIONS)):
+        pipeline = [
+            {"$match": {"comments.0": {"$exists": True}}},
+            {"$project": {"_id": 0, "id": 1, "max_comment_id": {"$max": "$comments.comment_id"}}}
+        ]
+        for doc in collection.aggregate(pipeline):
+            if doc.get("max_comment_id") is not None:
+                operations.append(UpdateOne(
+                    {"_id": f"{prefix}:{doc['id']}:comments"},
+                    {"$max": {"seq": doc["max_comment_id"]}},
+                    upsert=True
+                ))
+
+    if operations:
+        COUNTERS.bulk_write(operations, ordered=False)
+
+try:
+    sync_counters()
+except Exception as e:
+    print(f"Error syncing the id counters: {e}")
+
 # Configuración de Redis
 try:
-    redis_client = redis.Redis(host='redis', port=6379, db=0)
+    # Pool bloqueante del mismo tamaño que --worker-connections de gunicorn, al agotarse espera en vez de fallar
+    redis_pool = redis.BlockingConnectionPool(
+        host='redis',
+        port=6379,
+        db=REDIS_DB,
+        max_connections=50,
+        timeout=5,
+        socket_keepalive=True
+    )
+    redis_client = redis.Redis(connection_pool=redis_pool)
 except Exception as e:
     print(f"Error connecting to Redis: {e}")
 
 # Token estático para autenticación básica temporal
 STATIC_TOKEN = "SOYUNTOKEN"
+EXPECTED_TOKEN = STATIC_TOKEN.encode("utf-8")
+STATIC_TOKEN_USER_ID = 1  # sub del usuario al que corresponde el token estático
+
+# Endpoints que no requieren autenticación
+PUBLIC_ENDPOINTS = frozenset(["login", "signup"])
 
 # Middleware de autenticación
 @app.before_request
 def authenticate():
-    if request.endpoint not in ['login', 'signup']:
-        token = request.headers.get('Authorization')
-        if token != STATIC_TOKEN:
+    if request.endpoint not in PUBLIC_ENDPOINTS:
+        # Comparación en tiempo constante para no filtrar información por timing
+        token = request.headers.get('Authorization', '').encode("utf-8")
+        if not hmac.compare_digest(token, EXPECTED_TOKEN):
             return jsonify({"error": "Unauthorized"}), 401
+
+        # Se resuelve el sub una sola vez por request, los endpoints lo leen de g.user_id
+        g.user_id = STATIC_TOKEN_USER_ID
         
 
+# --------------------------------------- HELPERS ---------------------------------------
+
+# Obtener los nombres de varios destinos con una sola consulta $in
+# Retorna la lista de destinos y el primer id que no exista (o None)
+def get_destinations_by_ids(destination_ids):
+    docs = DESTINATIONS.find({"id": {"$in": destination_ids}}, {"_id": 0, "id": 1, "name": 1})
+    found = {d["id"]: d["name"] for d in docs}
+
+    missing = next((dest_id for dest_id in destination_ids if dest_id not in found), None)
+    if missing is not None:
+        return None, missing
+
+    return [{"id": dest_id, "name": found[dest_id]} for dest_id in destination_ids], None
+
+# Generar el siguiente id de una secuencia de forma atómica usando la colección counters
+def next_id(name):
+    counter = COUNTERS.find_one_and_update(
+        {"_id": name},
+        {"$inc": {"seq": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    return counter["seq"]
+
+# Saber si un DuplicateKeyError viene del índice único de id (y no de otro como el nombre)
+def duplicate_key_is_id(error):
+    return "id" in ((error.details or {}).get("keyPattern") or {})
+
+# Insertar un documento cuyo id viene del contador counter_name. Si el id ya existe el contador estaba atrasado,
+# se alinea solo ese contador con la colección y se reintenta una vez con un id nuevo
+def insert_with_counter_id(collection, counter_name, document):
+    try:
+        collection.insert_one(document)
+    except DuplicateKeyError as e:
+        if not duplicate_key_is_id(e):
+            raise
+        operation = counter_sync_operation(counter_name, collection)
+        if operation:
+            COUNTERS.bulk_write([operation])
+        document["id"] = next_id(counter_name)
+        collection.insert_one(document)
+
+# Obtener el nombre de usuario de un sub, primero de Redis y si no está de PostgreSQL
+# Retorna None si el usuario no existe
+def get_username(user_id):
+    key = f"user:name:{user_id}"
+    cached = redis_client.get(key)
+    if cached:
+        return cached.decode("utf-8")
+
+    with pg_cursor() as cursor:
+        cursor.execute("EXECUTE get_username(%s)", (user_id,))
+        row = cursor.fetchone()
+    if not row:
+        return None
+
+    redis_client.setex(key, USERNAME_CACHE_TTL, row[0])
+    return row[0]
+
+# Campos del cuerpo del request, se aceptan JSON o formulario (JSON evita el parser de formularios de Werkzeug)
+# Los campos se entregan como texto igual que en un formulario: los números se convierten a texto y los demás
+# tipos (listas, objetos, booleanos, null) se descartan, así las validaciones de cada endpoint responden 400
+def request_data():
+    data = request.get_json(silent=True)
+    if data is None:
+        return request.form
+    if not isinstance(data, dict):
+        # Un cuerpo JSON que no es un objeto se trata como un cuerpo sin campos
+        return {}
+    return {
+        key: value if isinstance(value, str) else str(value)
+        for key, value in data.items()
+        if isinstance(value, (str, int, float)) and not isinstance(value, bool)
+    }
+
+# Saber si una contraseña guardada ya es un hash de bcrypt, las de antes de bcrypt están en texto plano
+def is_bcrypt_hash(password_hash):
+    return password_hash.startswith("$2")
+
+# bcrypt es CPU puro: con los workers gevent todos los greenlets comparten un hilo, así que un hash en el hilo
+# del worker lo congela entero (~250 ms con costo 12). Se calcula en el threadpool de gevent, que sí corre
+# en otro hilo porque bcrypt libera el GIL, y el greenlet que espera cede el control a los demás
+
+# Hashear una contraseña con bcrypt
+def hash_password(password):
+    salt = bcrypt.gensalt(rounds=BCRYPT_ROUNDS)
+    return gevent.get_hub().threadpool.apply(bcrypt.hashpw, (password.encode("utf-8"), salt)).decode("utf-8")
+
+# Comparar una contraseña con su hash de bcrypt
+# Las contraseñas en texto plano de antes de bcrypt se comparan en tiempo constante, login las rehashea
+def check_password(password, password_hash):
+    if not is_bcrypt_hash(password_hash):
+        return hmac.compare_digest(password.encode("utf-8"), password_hash.encode("utf-8"))
+    try:
+        return gevent.get_hub().threadpool.apply(bcrypt.checkpw, (password.encode("utf-8"), password_hash.encode("utf-8")))
+    except ValueError:
+        # El hash guardado no es un hash de bcrypt válido
+        return False
+
+# Obtener todos los documentos de una colección, se cachea la respuesta JSON en Redis
+def get_cached_list(collection):
+    key = f"cache:{collection.name}"
+    cached = redis_client.get(key)
+    if cached:
+        return app.response_class(cached, mimetype="application/json")
+
+    cursor = collection.find({}, {"_id": 0}).batch_size(LIST_BATCH_SIZE)
+    payload = orjson.dumps(list(cursor))
+    redis_client.setex(key, LIST_CACHE_TTL, payload)
+    return app.response_class(payload, mimetype="application/json")
+
+# Responder un cursor de MongoDB como un arreglo JSON que se envía documento por documento,
+# cached son documentos ya serializados en JSON que se envían primero
+def stream_json_array(cursor, cached=()):
+    def generate():
+        documents = (orjson.dumps(document) for document in cursor.batch_size(LIST_BATCH_SIZE))
+        yield b"["
+        for index, document in enumerate(chain(cached, documents)):
+            if index:
+                yield b","
+            yield document
+        yield b"]"
+
+    return app.response_class(generate(), mimetype="application/json")
+
+# Filtro de los posts populares (con X reacciones o más), se evalúa en MongoDB
+POPULAR_POST_FILTER = {"$expr": {"$gte": [{"$size": {"$ifNull": ["$reactions", []]}}, X]}}
+
+# Actualizar el post cacheado cuando cambia, se cachea si es popular y si no se elimina de Redis
+def refresh_popular_post(post_id):
+    post = POSTS.find_one({"id": post_id, **POPULAR_POST_FILTER}, {"_id": 0})
+    if post:
+        redis_client.setex(f"post:{post_id}", POST_CACHE_TTL, orjson.dumps(post))
+    else:
+        redis_client.delete(f"post:{post_id}")
+
+# Proyección de los trip goals que se cachean y se devuelven, sin los ids de los seguidores
+TRIP_GOAL_PROJECTION = {"_id": 0, "followers.user_id": 0}
+
+# Guardar en Redis un trip goal ya actualizado (write-through), proyectado con TRIP_GOAL_PROJECTION
+def cache_trip_goal(trip_goal):
+    redis_client.setex(f"trip_goal:{trip_goal['id']}", TRIP_GOAL_CACHE_TTL, orjson.dumps(trip_goal))
+
+# Invalidar el listado cacheado de una colección cuando se modifica
+def invalidate_list_cache(collection):
+    redis_client.delete(f"cache:{collection.name}")
+
 # --------------------------------------- USERS ---------------------------------------
 
 # Signup
@@ -61,19 +471,21 @@ def signup():
     # Ya que no se especifica en el enunciado como se autentica el usuario, se presumia hacerlo con OAuth2 pero por simplicidad se hace con un token estático
 
     # Obtener los datos del usuario
-    username = request.form.get("username")
-    password = request.form.get("password")
+    data = request_data()
+    username = data.get("username")
+    password = data.get("password")
 
     # Validar que los datos requeridos estén presentes
     if not username or not password:
         return jsonify({"error": "Username and password are required"}), 400
     
+    # Hashear la contraseña con bcrypt, fuera del hilo del worker (ver hash_password)
+    password_hash = hash_password(password)
+
     # Insertar el usuario en la base de datos
-    cursor = pg_conn.cursor()
-    cursor.execute("INSERT INTO users (username, password) VALUES (%s, %s) RETURNING sub", (username, password))
-    user_id = cursor.fetchone()[0]
-    pg_conn.commit()
-    cursor.close()
+    with pg_cursor() as cursor:
+        cursor.execute("EXECUTE insert_user(%s, %s)", (username, password_hash))
+        user_id = cursor.fetchone()[0]
 
     return jsonify({"message": "User created successfully"})
 
@@ -84,26 +496,33 @@ def login():
     # Ya que no se especifica en el enunciado como se autentica el usuario, se presumia hacerlo con OAuth2 pero por simplicidad se hace con un token estático
 
     # Obtener los datos del usuario
-    username = request.form.get("username")
-    password = request.form.get("password")
+    data = request_data()
+    username = data.get("username")
+    password = data.get("password")
 
     # Validar que los datos requeridos estén presentes
     if not username or not password:
         return jsonify({"error": "Username and password are required"}), 400
     
     # Verificar las credenciales en la base de datos
-    cursor = pg_conn.cursor()
-    cursor.execute("SELECT sub FROM users WHERE username = %s AND password = %s", (username, password))
-    user_id = cursor.fetchone()
-    cursor.close()
+    with pg_cursor() as cursor:
+        cursor.execute("EXECUTE get_user_credentials(%s)", (username,))
+        users = cursor.fetchall()
+    match = next(((sub, password_hash) for sub, password_hash in users if check_password(password, password_hash)), None)
 
-    if not user_id:
+    if not match:
         return jsonify({"error": "Invalid credentials"}), 401
+    user_id, password_hash = match
+
+    # Una contraseña en texto plano que coincide se reemplaza por su hash bcrypt, así solo se acepta una vez sin hash
+    if not is_bcrypt_hash(password_hash):
+        with pg_cursor() as cursor:
+            cursor.execute("EXECUTE update_password(%s, %s)", (hash_password(password), user_id))
     
     
-    # Guardar la sesión en Redis con un TTL de 10 horas (36000 segundos)
-    session_id = "session_id_example"  # Aquí se generaría un ID de sesión único
-    redis_client.setex(f"session:{session_id}", 36000, STATIC_TOKEN)
+    # Guardar la sesión en Redis con un TTL de 10 horas (36000 segundos), el valor es el sub del usuario
+    session_id = secrets.token_urlsafe(32)
+    redis_client.setex(f"session:{session_id}", 36000, str(user_id))
     
     return jsonify({"message": "Login successful", "token": STATIC_TOKEN, "session_id": session_id})
 
@@ -130,31 +549,56 @@ def check_session():
     if not session_id:
         return jsonify({"error": "Session-ID is required"}), 400
 
-    # Comprobar si el cookie es igual al de Redis
-    token = redis_client.get(f"session:{session_id}")
-    if token:
-        # Reiniciar el TTL de 10 horas (36000 segundos)
-        redis_client.expire(f"session:{session_id}", 36000)
-        return jsonify({"message": "Session is valid"})
-    else:
-        return jsonify({"error": "Session is invalid"}), 401
+    # Comprobar si el cookie es igual al de Redis y reiniciar el TTL de 10 horas (36000 segundos)
+    # en un solo pipeline, si la sesión no existe el EXPIRE no hace nada
+    pipe = redis_client.pipeline()
+    pipe.get(f"session:{session_id}")
+    pipe.expire(f"session:{session_id}", 36000)
+    user_id, _ = pipe.execute()
+    if user_id:
+        try:
+            return jsonify({"message": "Session is valid", "user_id": int(user_id)})
+        except ValueError:
+            # Sesión anterior al sub en el valor (guardaba el token estático), se elimina y se trata como inválida
+            redis_client.delete(f"session:{session_id}")
+    return jsonify({"error": "Session is invalid"}), 401
 
 # --------------------------------------- POSTS ---------------------------------------
 
-# Obtener todos los posts
+# Obtener todos los posts, o solo los indicados en ?ids=1,2,3
 @app.route("/posts", methods=["GET"])
 def get_posts():
-    posts_collection = mongo_db["posts"]
-    posts = list(posts_collection.find({}, {"_id": 0}))
-    return jsonify(posts)
+    post_ids = request.args.get("ids")
+    if not post_ids:
+        return get_cached_list(POSTS)
+
+    try:
+        post_ids = [int(post_id) for post_id in post_ids.split(",")]
+    except ValueError:
+        return jsonify({"error": "Invalid format for post IDs"}), 400
+
+    # Obtener de Redis en un solo MGET los posts cacheados, ya serializados en JSON
+    cached = dict(zip(post_ids, redis_client.mget([f"post:{post_id}" for post_id in post_ids])))
+
+    # Obtener de MongoDB en una sola consulta los que no estaban en Redis
+    missing = [post_id for post_id, post in cached.items() if post is None]
+    if missing:
+        for post in POSTS.find({"id": {"$in": missing}}, {"_id": 0}):
+            if cached.get(post["id"]) is None:
+                cached[post["id"]] = orjson.dumps(post)
+
+    # Armar la respuesta en el orden pedido, omitiendo los posts que no existen
+    posts = [cached[post_id] for post_id in dict.fromkeys(post_ids) if cached[post_id] not in (None, POST_NOT_FOUND)]
+    return app.response_class(b"[" + b",".join(posts) + b"]", mimetype="application/json")
 
 # Crear un nuevo post
 @app.route("/posts", methods=["POST"])
 def create_post():
     # Obtener los datos del post
-    content = request.form.get("content")
-    media = request.form.get("media")
-    destinations = request.form.get("destinations")
+    data = request_data()
+    content = data.get("content")
+    media = data.get("media")
+    destinations = data.get("destinations")
 
     # Logica para convertir en lista media y destinations
     if media:
@@ -165,59 +609,51 @@ def create_post():
         except ValueError:
             return jsonify({"error": "Invalid format for destinations"}), 400
 
-    # Obtener el sub de usuario desde el token y el nombre de usuario desde la base de datos
-    user_id = 1  # Aquí iría la lógica para obtener el sub de usuario desde el token
-    cursor = pg_conn.cursor()
-    cursor.execute("SELECT username FROM users WHERE sub = %s", (user_id,))
-    userName = cursor.fetchone()[0]
+    # Obtener el sub de usuario desde el token
+    user_id = g.user_id
 
     # Validar que los datos requeridos estén presentes
     if not content or not destinations or not media:
         return jsonify({"error": "Content, destinations, and media are required"}), 400
 
     # Validar que los destinos existan en MongoDB y obtener sus nombres
-    destinations_collection = mongo_db["destinations"]
-    valid_destinations = []
-    for destination_id in destinations:
-        db_destination = destinations_collection.find_one({"id": destination_id}, {"_id": 0, "name": 1})
-        if not db_destination:
-            return jsonify({"error": f"Destination with id {destination_id} not found"}), 404
-        valid_destinations.append({"id": destination_id, "name": db_destination["name"]})
-
-    # Insertar relacion en postgres
-    cursor.execute("INSERT INTO posts (sub) VALUES (%s) RETURNING post_id", (user_id,))
-    post_id = cursor.fetchone()[0]
-
-    # Insertar post en MongoDB
-    posts_collection = mongo_db["posts"]
-    post = {
-        "user_id": user_id,
-        "id": post_id,
-        "userName": userName,
-        "content": content,
-        "media": media,
-        "destinations": valid_destinations,
-        "reactions": [],
-        "comments": []
-    }
-
-    posts_collection.insert_one(post)
-
-    # Espacio por si se quiere agregar un cache en Redis
-
-    pg_conn.commit()
-    cursor.close()
+    valid_destinations, missing = get_destinations_by_ids(destinations)
+    if missing is not None:
+        return jsonify({"error": f"Destination with id {missing} not found"}), 404
+
+    # Insertar relacion en postgres y obtener el nombre de usuario en la misma consulta,
+    # se hace commit solo si el insert en MongoDB no falla
+    with pg_cursor() as cursor:
+        cursor.execute("EXECUTE insert_post(%s)", (user_id,))
+        post_id, userName = cursor.fetchone()
+
+        # Insertar post en MongoDB
+        post = {
+            "user_id": user_id,
+            "id": post_id,
+            "userName": userName,
+            "content": content,
+            "media": media,
+            "destinations": valid_destinations,
+            "reactions": [],
+            "comments": []
+        }
+
+        POSTS.insert_one(post)
+
+    # Se elimina un posible "no existe" cacheado para este id
+    redis_client.delete(f"post:{post_id}")
+    invalidate_list_cache(POSTS)
     return jsonify({"message": "Post created successfully"})
 
 # Editar un post (solo el usuario que lo creó)
 @app.route("/posts/<int:post_id>", methods=["PUT"])
 def edit_post(post_id):
     # Obtener el sub de usuario desde el token
-    user_id = 1
+    user_id = g.user_id
 
-    # Obtener el post de MongoDB
-    posts_collection = mongo_db["posts"]
-    post = posts_collection.find_one({"id": post_id})
+    # Obtener el creador del post de MongoDB
+    post = POSTS.find_one({"id": post_id}, {"user_id": 1, "_id": 0})
     if not post:
         return jsonify({"error": "Post not found"}), 404
 
@@ -226,33 +662,38 @@ def edit_post(post_id):
         return jsonify({"error": "Unauthorized"}), 401
 
     # Obtener los datos del post
-    content = request.form.get("content")
-    media = request.form.get("media")
-    destinations = request.form.get("destinations")
+    data = request_data()
+    content = data.get("content")
+    media = data.get("media")
+    destinations = data.get("destinations")
 
-    # Editar los campos del post
+    # Editar solo los campos enviados
+    updates = {}
     if content:
-        post["content"] = content + " (Editado)"
+        updates["content"] = content + " (Editado)"
     if media:
-        post["media"] = media.split(",")
+        updates["media"] = media.split(",")
     if destinations:
         try:
-            post["destinations"] = [int(dest_id) for dest_id in destinations.split(",")]
+            updates["destinations"] = [int(dest_id) for dest_id in destinations.split(",")]
         except ValueError:
             return jsonify({"error": "Invalid format for destinations"}), 400
 
-    posts_collection.update_one({"id": post_id}, {"$set": post})
+    if updates:
+        POSTS.update_one({"id": post_id}, {"$set": updates})
+        # Si el post está cacheado por popular, la copia de Redis debe reflejar la edición
+        refresh_popular_post(post_id)
+    invalidate_list_cache(POSTS)
     return jsonify({"message": "Post edited successfully"})
 
 # Eliminar un post (solo el usuario que lo creó)
 @app.route("/posts/<int:post_id>", methods=["DELETE"])
 def delete_post(post_id):
     # Obtener el sub de usuario desde el token
-    user_id = 1
+    user_id = g.user_id
 
-    # Obtener el post de MongoDB
-    posts_collection = mongo_db["posts"]
-    post = posts_collection.find_one({"id": post_id})
+    # Obtener el creador del post de MongoDB
+    post = POSTS.find_one({"id": post_id}, {"user_id": 1, "_id": 0})
     if not post:
         return jsonify({"error": "Post not found"}), 404
 
@@ -260,8 +701,11 @@ def delete_post(post_id):
     if post["user_id"] != user_id:
         return jsonify({"error": "Unauthorized"}), 401
 
-    # Eliminar el post
-    posts_collection.delete_one({"id": post_id})
+    # Eliminar el post y el contador de sus comentarios
+    POSTS.delete_one({"id": post_id})
+    COUNTERS.delete_one({"_id": f"posts:{post_id}:comments"})
+    redis_client.delete(f"post:{post_id}")
+    invalidate_list_cache(POSTS)
     return jsonify({"message": "Post deleted successfully"})
 
 
@@ -274,72 +718,70 @@ def delete_post(post_id):
 @app.route("/destinations/<int:destination_id>/comments/<int:comment_id>/reactions", methods=["POST"])
 def react_to_post_comment_or_destination(post_id=None, comment_id=None, destination_id=None):
     # Obtener el sub de usuario desde el token
-    user_id = 1
+    user_id = g.user_id
 
     # Obtener el nombre de usuario desde la base de datos
-    cursor = pg_conn.cursor()
-    cursor.execute("SELECT username FROM users WHERE sub = %s", (user_id,))
-    userName = cursor.fetchone()[0]
+    userName = get_username(user_id)
 
     # Validar que la reacción sea válida
-    reaction = request.form.get("reaction")
+    data = request_data()
+    reaction = data.get("reaction")
     if reaction not in REACTIONS:
         return jsonify({"error": "Invalid reaction"}), 400
 
     if post_id is not None:
-        # Obtener el post de MongoDB
-        posts_collection = mongo_db["posts"]
-        post = posts_collection.find_one({"id": post_id})
-        if not post:
-            return jsonify({"error": "Post not found"}), 404
-        
-        if comment_id is None:
-            # Reaccionar a un post
-            target = post
-        else:
-            # Reaccionar a un comentario de un post
-            target = next((c for c in post["comments"] if c.get("comment_id") == comment_id), None)
-            if not target:
-                return jsonify({"error": "Comment not found"}), 404
-
-    elif destination_id is not None:
-        # Obtener el destino de MongoDB
-        destinations_collection = mongo_db["destinations"]
-        destination = destinations_collection.find_one({"id": destination_id})
-        if not destination:
-            return jsonify({"error": "Destination not found"}), 404
-        
-        if comment_id is None:
-            # Reaccionar a un destino
-            target = destination
-        else:
-            # Reaccionar a un comentario de un destino
-            target = next((c for c in destination["comments"] if c.get("comment_id") == comment_id), None)
-            if not target:
-                return jsonify({"error": "Comment not found"}), 404
-
-    # Verificar si el usuario ya ha reaccionado
-    for user_reaction in target["reactions"]:
-        if user_reaction.get("user_id") == user_id:
-            if user_reaction["reaction"] == reaction:
-                return jsonify({"error": "User has already reacted with the same reaction"}), 400
-            else:
-                # Eliminar la reacción anterior
-                target["reactions"] = [r for r in target["reactions"] if r.get("user_id") != user_id]
-                break
-    
-    # Insertar la nueva reacción
-    target["reactions"].append({
+        collection = POSTS
+        target_id = post_id
+        not_found = "Post not found"
+    else:
+        collection = DESTINATIONS
+        target_id = destination_id
+        not_found = "Destination not found"
+
+    new_reaction = {
         "user_id": user_id,
         "userName": userName,
         "reaction": reaction
-    })
+    }
 
-    if post_id is not None:
-        posts_collection.update_one({"id": post_id}, {"$set": post})
-    elif destination_id is not None:
-        destinations_collection.update_one({"id": destination_id}, {"$set": destination})
+    # Se quita la reacción anterior del usuario (si es distinta) y se agrega la nueva en un solo bulk_write,
+    # el $push solo se aplica si el usuario no tiene ya una reacción, asi no se pisan reacciones concurrentes
+    if comment_id is None:
+        # Reaccionar a un post o destino
+        query = {"id": target_id}
+        ops = [
+            UpdateOne(query, {"$pull": {"reactions": {"user_id": user_id, "reaction": {"$ne": reaction}}}}),
+            UpdateOne({"id": target_id, "reactions.user_id": {"$ne": user_id}}, {"$push": {"reactions": new_reaction}})
+        ]
+    else:
+        # Reaccionar a un comentario de un post o destino
+        query = {"id": target_id, "comments.comment_id": comment_id}
+        ops = [
+            UpdateOne(
+                query,
+                {"$pull": {"comments.$[c].reactions": {"user_id": user_id, "reaction": {"$ne": reaction}}}},
+                array_filters=[{"c.comment_id": comment_id}]
+            ),
+            UpdateOne(
+                query,
+                {"$push": {"comments.$[c].reactions": new_reaction}},
+                array_filters=[{"c.comment_id": comment_id, "c.reactions.user_id": {"$ne": user_id}}]
+            )
+        ]
+
+    result = collection.bulk_write(ops, ordered=True)
+    if result.matched_count == 0:
+        if comment_id is not None and collection.count_documents({"id": target_id}, limit=1):
+            return jsonify({"error": "Comment not found"}), 404
+        return jsonify({"error": not_found}), 404
 
+    # Si no se modificó nada el usuario ya tenía la misma reacción
+    if result.modified_count == 0:
+        return jsonify({"error": "User has already reacted with the same reaction"}), 400
+
+    invalidate_list_cache(collection)
+    if post_id is not None:
+        refresh_popular_post(post_id)
     return jsonify({"message": "Reaction added successfully"})
 
 # Eliminar reacción a un post, comentario o destino
@@ -349,48 +791,37 @@ def react_to_post_comment_or_destination(post_id=None, comment_id=None, destinat
 @app.route("/destinations/<int:destination_id>/comments/<int:comment_id>/reactions", methods=["DELETE"])
 def delete_reaction(post_id=None, comment_id=None, destination_id=None):
     # Obtener el sub de usuario desde el token
-    user_id = 1
+    user_id = g.user_id
 
     if post_id is not None:
-        # Obtener el post de MongoDB
-        posts_collection = mongo_db["posts"]
-        post = posts_collection.find_one({"id": post_id})
-        if not post:
-            return jsonify({"error": "Post not found"}), 404
-        
-        if comment_id is None:
-            # Eliminar reacción de un post
-            target = post
-        else:
-            # Eliminar reacción de un comentario de un post
-            target = next((c for c in post["comments"] if c.get("comment_id") == comment_id), None)
-            if not target:
-                return jsonify({"error": "Comment not found"}), 404
-
-    elif destination_id is not None:
-        # Obtener el destino de MongoDB
-        destinations_collection = mongo_db["destinations"]
-        destination = destinations_collection.find_one({"id": destination_id})
-        if not destination:
-            return jsonify({"error": "Destination not found"}), 404
-        
-        if comment_id is None:
-            # Eliminar reacción de un destino
-            target = destination
-        else:
-            # Eliminar reacción de un comentario de un destino
-            target = next((c for c in destination["comments"] if c.get("comment_id") == comment_id), None)
-            if not target:
-                return jsonify({"error": "Comment not found"}), 404
-
-    # Eliminar reacción
-    target["reactions"] = [reaction for reaction in target["reactions"] if reaction.get("user_id") != user_id]
+        collection = POSTS
+        target_id = post_id
+        not_found = "Post not found"
+    else:
+        collection = DESTINATIONS
+        target_id = destination_id
+        not_found = "Destination not found"
+
+    # Eliminar reacción con un solo $pull
+    if comment_id is None:
+        # Eliminar reacción de un post o destino
+        result = collection.update_one({"id": target_id}, {"$pull": {"reactions": {"user_id": user_id}}})
+    else:
+        # Eliminar reacción de un comentario de un post o destino
+        result = collection.update_one(
+            {"id": target_id, "comments.comment_id": comment_id},
+            {"$pull": {"comments.$[c].reactions": {"user_id": user_id}}},
+            array_filters=[{"c.comment_id": comment_id}]
+        )
+
+    if result.matched_count == 0:
+        if comment_id is not None and collection.count_documents({"id": target_id}, limit=1):
+            return jsonify({"error": "Comment not found"}), 404
+        return jsonify({"error": not_found}), 404
 
+    invalidate_list_cache(collection)
     if post_id is not None:
-        posts_collection.update_one({"id": post_id}, {"$set": post})
-    elif destination_id is not None:
-        destinations_collection.update_one({"id": destination_id}, {"$set": destination})
-
+        refresh_popular_post(post_id)
     return jsonify({"message": "Reaction deleted successfully"})
 
 # --------------------------------------- COMMENTS ---------------------------------------
@@ -400,199 +831,157 @@ def delete_reaction(post_id=None, comment_id=None, destination_id=None):
 @app.route("/destinations/<int:destination_id>/comments", methods=["POST"])
 def comment_on_post_or_destination(post_id=None, destination_id=None):
     # Obtener el sub de usuario desde el token
-    user_id = 1
+    user_id = g.user_id
 
     # Obtener el nombre de usuario desde la base de datos
-    cursor = pg_conn.cursor()
-    cursor.execute("SELECT username FROM users WHERE sub = %s", (user_id,))
-    userName = cursor.fetchone()[0]
+    userName = get_username(user_id)
 
     if post_id is not None:
-        # Obtener el post de MongoDB
-        posts_collection = mongo_db["posts"]
-        post = posts_collection.find_one({"id": post_id})
-        if not post:
-            return jsonify({"error": "Post not found"}), 404
-        
-        # Obtener el comentario
-        comment = request.form.get("comment")
-        if not comment:
-            return jsonify({"error": "Comment is required"}), 400
-        
-        # Generar un comment_id único
-        comment_id = len(post["comments"]) + 1
-
-        # Insertar el comentario en el post
-        post["comments"].append({
-            "comment_id": comment_id,
-            "user_id": user_id,
-            "userName": userName,
-            "comment": comment,
-            "reactions": []
-        })
-
-        posts_collection.update_one({"id": post_id}, {"$set": post})
-        return jsonify({"message": "Comment added successfully"})
-
-    elif destination_id is not None:
-        # Obtener el destino de MongoDB
-        destinations_collection = mongo_db["destinations"]
-        destination = destinations_collection.find_one({"id": destination_id})
-        if not destination:
-            return jsonify({"error": "Destination not found"}), 404
-        
-        # Obtener el comentario
-        comment = request.form.get("comment")
-        if not comment:
-            return jsonify({"error": "Comment is required"}), 400
-        
-        # Generar un comment_id único
-        comment_id = len(destination["comments"]) + 1
-
-        # Insertar el comentario en el destino
-        destination["comments"].append({
+        collection = POSTS
+        counter_name = f"posts:{post_id}:comments"
+        target_id = post_id
+        not_found = "Post not found"
+    else:
+        collection = DESTINATIONS
+        counter_name = f"destinations:{destination_id}:comments"
+        target_id = destination_id
+        not_found = "Destination not found"
+
+    # Obtener el comentario
+    data = request_data()
+    comment = data.get("comment")
+    if not comment:
+        return jsonify({"error": "Comment is required"}), 400
+
+    # Generar un comment_id único
+    comment_id = next_id(counter_name)
+
+    # Insertar el comentario con $push, sin leer ni reescribir el documento completo
+    result = collection.update_one(
+        {"id": target_id},
+        {"$push": {"comments": {
             "comment_id": comment_id,
             "user_id": user_id,
             "userName": userName,
             "comment": comment,
             "reactions": []
-        })
+        }}}
+    )
+    if result.matched_count == 0:
+        # Eliminar el contador creado para un post o destino que no existe
+        COUNTERS.delete_one({"_id": counter_name})
+        return jsonify({"error": not_found}), 404
 
-        destinations_collection.update_one({"id": destination_id}, {"$set": destination})
-        return jsonify({"message": "Comment added successfully"})
+    invalidate_list_cache(collection)
+    if post_id is not None:
+        refresh_popular_post(post_id)
+    return jsonify({"message": "Comment added successfully"})
 
 # Editar un comentario en un post o un destino
 @app.route("/posts/<int:post_id>/comments/<int:comment_id>", methods=["PUT"])
 @app.route("/destinations/<int:destination_id>/comments/<int:comment_id>", methods=["PUT"])
 def edit_comment(post_id=None, destination_id=None, comment_id=None):
     # Obtener el sub de usuario desde el token
-    user_id = 1
+    user_id = g.user_id
 
     if post_id is not None:
-        # Obtener el post de MongoDB
-        posts_collection = mongo_db["posts"]
-        post = posts_collection.find_one({"id": post_id})
-        if not post:
-            return jsonify({"error": "Post not found"}), 404
-        
-        # Buscar el comentario
-        comment = next((c for c in post["comments"] if c.get("comment_id") == comment_id and c.get("user_id") == user_id), None)
-        if not comment:
-            return jsonify({"error": "Comment not found"}), 404
-
-        # Editar el comentario
-        new_comment = request.form.get("comment")
-        if not new_comment:
-            return jsonify({"error": "Comment is required"}), 400
-        
-        comment["comment"] = new_comment + " (Editado)"
-        posts_collection.update_one({"id": post_id}, {"$set": post})
-        return jsonify({"message": "Comment edited successfully"})
-
-    elif destination_id is not None:
-        # Obtener el destino de MongoDB
-        destinations_collection = mongo_db["destinations"]
-        destination = destinations_collection.find_one({"id": destination_id})
-        if not destination:
-            return jsonify({"error": "Destination not found"}), 404
-        
-        # Buscar el comentario
-        comment = next((c for c in destination["comments"] if c.get("comment_id") == comment_id and c.get("user_id") == user_id), None)
-        if not comment:
+        collection = POSTS
+        target_id = post_id
+        not_found = "Post not found"
+    else:
+        collection = DESTINATIONS
+        target_id = destination_id
+        not_found = "Destination not found"
+
+    # Obtener el nuevo comentario
+    data = request_data()
+    new_comment = data.get("comment")
+    if not new_comment:
+        return jsonify({"error": "Comment is required"}), 400
+
+    # Editar el comentario con el operador posicional, el filtro valida que el comentario sea del usuario
+    result = collection.update_one(
+        {"id": target_id, "comments": {"$elemMatch": {"comment_id": comment_id, "user_id": user_id}}},
+        {"$set": {"comments.$.comment": new_comment + " (Editado)"}}
+    )
+    if result.matched_count == 0:
+        if collection.count_documents({"id": target_id}, limit=1):
             return jsonify({"error": "Comment not found"}), 404
+        return jsonify({"error": not_found}), 404
 
-        # Editar el comentario
-        new_comment = request.form.get("comment")
-        if not new_comment:
-            return jsonify({"error": "Comment is required"}), 400
-        
-        comment["comment"] = new_comment + " (Editado)"
-        destinations_collection.update_one({"id": destination_id}, {"$set": destination})
-        return jsonify({"message": "Comment edited successfully"})
+    invalidate_list_cache(collection)
+    if post_id is not None:
+        refresh_popular_post(post_id)
+    return jsonify({"message": "Comment edited successfully"})
 
 # Eliminar un comentario de un post o un destino
 @app.route("/posts/<int:post_id>/comments/<int:comment_id>", methods=["DELETE"])
 @app.route("/destinations/<int:destination_id>/comments/<int:comment_id>", methods=["DELETE"])
 def delete_comment(post_id=None, destination_id=None, comment_id=None):
     # Obtener el sub de usuario desde el token
-    user_id = 1
+    user_id = g.user_id
 
     if post_id is not None:
-        # Obtener el post de MongoDB
-        posts_collection = mongo_db["posts"]
-        post = posts_collection.find_one({"id": post_id})
-        if not post:
-            return jsonify({"error": "Post not found"}), 404
-        
-        # Buscar el comentario
-        comment = next((c for c in post["comments"] if c.get("comment_id") == comment_id and c.get("user_id") == user_id), None)
-        if not comment:
-            return jsonify({"error": "Comment not found"}), 404
-        
-        # Eliminar el comentario
-        post["comments"] = [c for c in post["comments"] if c.get("comment_id") != comment_id]
-        posts_collection.update_one({"id": post_id}, {"$set": post})
-        return jsonify({"message": "Comment deleted successfully"})
-
-    elif destination_id is not None:
-        # Obtener el destino de MongoDB
-        destinations_collection = mongo_db["destinations"]
-        destination = destinations_collection.find_one({"id": destination_id})
-        if not destination:
-            return jsonify({"error": "Destination not found"}), 404
-        
-        # Buscar el comentario
-        comment = next((c for c in destination["comments"] if c.get("comment_id") == comment_id and c.get("user_id") == user_id), None)
-        if not comment:
+        collection = POSTS
+        target_id = post_id
+        not_found = "Post not found"
+    else:
+        collection = DESTINATIONS
+        target_id = destination_id
+        not_found = "Destination not found"
+
+    # Eliminar el comentario con $pull, el filtro valida que el comentario sea del usuario
+    result = collection.update_one(
+        {"id": target_id, "comments": {"$elemMatch": {"comment_id": comment_id, "user_id": user_id}}},
+        {"$pull": {"comments": {"comment_id": comment_id, "user_id": user_id}}}
+    )
+    if result.matched_count == 0:
+        if collection.count_documents({"id": target_id}, limit=1):
             return jsonify({"error": "Comment not found"}), 404
-        
-        # Eliminar el comentario
-        destination["comments"] = [c for c in destination["comments"] if c.get("comment_id") != comment_id]
-        destinations_collection.update_one({"id": destination_id}, {"$set": destination})
-        return jsonify({"message": "Comment deleted successfully"})
+        return jsonify({"error": not_found}), 404
+
+    invalidate_list_cache(collection)
+    if post_id is not None:
+        refresh_popular_post(post_id)
+    return jsonify({"message": "Comment deleted successfully"})
 
 # --------------------------------------- DESTINATIONS ---------------------------------------
 
 # Obtener destinos
 @app.route("/destinations", methods=["GET"])
 def get_destinations():
-    destinations_collection = mongo_db["destinations"]
-    destinations = list(destinations_collection.find({}, {"_id": 0}))
-    return jsonify(destinations)
+    return get_cached_list(DESTINATIONS)
 
 # Agregar un destino
 @app.route("/destinations", methods=["POST"])
 def add_destination():
     # Obtener el sub de usuario desde el token
-    user_id = 1
+    user_id = g.user_id
 
     # Obtener el nombre de usuario desde la base de datos
-    cursor = pg_conn.cursor()
-    cursor.execute("SELECT username FROM users WHERE sub = %s", (user_id,))
-    userName = cursor.fetchone()[0]
+    userName = get_username(user_id)
 
     # Obtener los datos del destino
-    name = request.form.get("name")
-    description = request.form.get("description")
-    city = request.form.get("city")
-    country = request.form.get("country")
-    media = request.form.get("media")
+    data = request_data()
+    name = data.get("name")
+    description = data.get("description")
+    city = data.get("city")
+    country = data.get("country")
+    media = data.get("media")
 
     # Validar que los datos requeridos estén presentes
     if not name or not description or not city or not country or not media:
         return jsonify({"error": "All fields are required"}), 400
 
     # Verificar que el nombre del destino sea único
-    destinations_collection = mongo_db["destinations"]
-    if destinations_collection.find_one({"name": name}):
+    if DESTINATIONS.count_documents({"name": name}, limit=1):
         return jsonify({"error": "Destination name must be unique"}), 400
 
     # Logica para convertir en lista media
     media = media.split(",")
 
     # Generar un id único para el destino
-    last_destination = destinations_collection.find_one(sort=[("id", -1)])
-    destination_id = last_destination["id"] + 1 if last_destination else 1
+    destination_id = next_id("destinations")
 
     # Crear el destino
     destination = {
@@ -609,18 +998,24 @@ def add_destination():
     }
 
     # Insertar el destino en MongoDB
-    destinations_collection.insert_one(destination)
+    try:
+        insert_with_counter_id(DESTINATIONS, "destinations", destination)
+    except DuplicateKeyError as e:
+        # Un id que sigue repetido tras el reintento no es un problema del nombre
+        if duplicate_key_is_id(e):
+            raise
+        return jsonify({"error": "Destination name must be unique"}), 400
+    invalidate_list_cache(DESTINATIONS)
     return jsonify({"message": "Destination added successfully"})
 
 # Editar un destino (solo el usuario que lo creó)
 @app.route("/destinations/<int:destination_id>", methods=["PUT"])
 def edit_destination(destination_id):
     # Obtener el sub de usuario desde el token
-    user_id = 1
+    user_id = g.user_id
 
-    # Obtener el destino de MongoDB
-    destinations_collection = mongo_db["destinations"]
-    destination = destinations_collection.find_one({"id": destination_id})
+    # Obtener el creador del destino de MongoDB
+    destination = DESTINATIONS.find_one({"id": destination_id}, {"user_id": 1, "_id": 0})
     if not destination:
         return jsonify({"error": "Destination not found"}), 404
 
@@ -629,36 +1024,42 @@ def edit_destination(destination_id):
         return jsonify({"error": "Unauthorized"}), 401
 
     # Obtener los datos del destino
-    name = request.form.get("name")
-    description = request.form.get("description")
-    city = request.form.get("city")
-    country = request.form.get("country")
-    media = request.form.get("media")
-
-    # Editar los campos del destino
+    data = request_data()
+    name = data.get("name")
+    description = data.get("description")
+    city = data.get("city")
+    country = data.get("country")
+    media = data.get("media")
+
+    # Editar solo los campos enviados
+    updates = {}
     if name:
-        destination["name"] = name
+        updates["name"] = name
     if description:
-        destination["description"] = description
+        updates["description"] = description
     if city:
-        destination["city"] = city
+        updates["city"] = city
     if country:
-        destination["country"] = country
+        updates["country"] = country
     if media:
-        destination["media"] = media.split(",")
+        updates["media"] = media.split(",")
 
-    destinations_collection.update_one({"id": destination_id}, {"$set": destination})
+    if updates:
+        try:
+            DESTINATIONS.update_one({"id": destination_id}, {"$set": updates})
+        except DuplicateKeyError:
+            return jsonify({"error": "Destination name must be unique"}), 400
+    invalidate_list_cache(DESTINATIONS)
     return jsonify({"message": "Destination edited successfully"})
 
 # Eliminar un destino (solo el usuario que lo creó)
 @app.route("/destinations/<int:destination_id>", methods=["DELETE"])
 def delete_destination(destination_id):
     # Obtener el sub de usuario desde el token
-    user_id = 1
+    user_id = g.user_id
 
-    # Obtener el destino de MongoDB
-    destinations_collection = mongo_db["destinations"]
-    destination = destinations_collection.find_one({"id": destination_id})
+    # Obtener el creador del destino de MongoDB
+    destination = DESTINATIONS.find_one({"id": destination_id}, {"user_id": 1, "_id": 0})
     if not destination:
         return jsonify({"error": "Destination not found"}), 404
 
@@ -666,8 +1067,10 @@ def delete_destination(destination_id):
     if destination["user_id"] != user_id:
         return jsonify({"error": "Unauthorized"}), 401
 
-    # Eliminar el destino
-    destinations_collection.delete_one({"id": destination_id})
+    # Eliminar el destino y el contador de sus comentarios
+    DESTINATIONS.delete_one({"id": destination_id})
+    COUNTERS.delete_one({"_id": f"destinations:{destination_id}:comments"})
+    invalidate_list_cache(DESTINATIONS)
     return jsonify({"message": "Destination deleted successfully"})
 
 # --------------------------------------- TripGoals ---------------------------------------
@@ -677,14 +1080,11 @@ def delete_destination(destination_id):
 def get_trip_goals(user_id):
     
     # Verificar que el usuario exista en la base de datos
-    cursor = pg_conn.cursor()
-    cursor.execute("SELECT username FROM users WHERE sub = %s", (user_id,))
-    if not cursor.fetchone():
+    if get_username(user_id) is None:
         return jsonify({"error": "User not found"}), 404
 
     # Obtener los trip goals del usuario desde MongoDB
-    trip_goals_collection = mongo_db["tripGoals"]
-    trip_goals = trip_goals_collection.find_one({"user_id": user_id}, {"_id": 0})
+    trip_goals = TRIP_GOALS.find_one({"user_id": user_id}, {"_id": 0})
 
     if not trip_goals:
         return jsonify({"error": "Trip goals not found"}), 404
@@ -695,15 +1095,14 @@ def get_trip_goals(user_id):
 @app.route("/trip-goals", methods=["POST"])
 def add_trip_goal():
     # Obtener el sub de usuario desde el token
-    user_id = 1
+    user_id = g.user_id
 
     # Obtener el nombre de usuario desde la base de datos
-    cursor = pg_conn.cursor()
-    cursor.execute("SELECT username FROM users WHERE sub = %s", (user_id,))
-    userName = cursor.fetchone()[0]
+    userName = get_username(user_id)
 
     # Obtener los datos del trip goal
-    destination_ids = request.form.get("destination_ids")
+    data = request_data()
+    destination_ids = data.get("destination_ids")
     if not destination_ids:
         return jsonify({"error": "Destination IDs are required"}), 400
 
@@ -713,20 +1112,12 @@ def add_trip_goal():
         return jsonify({"error": "Invalid format for destination IDs"}), 400
 
     # Validar que los destinos existan en MongoDB y obtener sus nombres
-    destinations_collection = mongo_db["destinations"]
-    destinations = []
-    for destination_id in destination_ids:
-        db_destination = destinations_collection.find_one({"id": destination_id}, {"_id": 0, "name": 1})
-        if not db_destination:
-            return jsonify({"error": f"Destination with id {destination_id} not found"}), 404
-        destinations.append({"id": destination_id, "name": db_destination["name"]})
-
-    # Obtener la colección de trip goals
-    trip_goals_collection = mongo_db["tripGoals"]
+    destinations, missing = get_destinations_by_ids(destination_ids)
+    if missing is not None:
+        return jsonify({"error": f"Destination with id {missing} not found"}), 404
 
     # Generar un id único para el trip goal
-    last_trip_goal = trip_goals_collection.find_one(sort=[("id", -1)])
-    trip_goal_id = last_trip_goal["id"] + 1 if last_trip_goal else 1
+    trip_goal_id = next_id("tripGoals")
 
     # Crear el trip goal
     trip_goal = {
@@ -737,19 +1128,20 @@ def add_trip_goal():
         "followers": []
     }
 
-    # Insertar el trip goal en MongoDB
-    trip_goals_collection.insert_one(trip_goal)
+    # Insertar el trip goal en MongoDB y cachearlo, insert_one agrega el _id al diccionario
+    insert_with_counter_id(TRIP_GOALS, "tripGoals", trip_goal)
+    del trip_goal["_id"]
+    cache_trip_goal(trip_goal)
     return jsonify({"message": "Trip goal added successfully"})
 
 # Editar un trip goal (solo el usuario que lo creó)
 @app.route("/trip-goals/<int:trip_goal_id>", methods=["PUT"])
 def edit_trip_goal(trip_goal_id):
     # Obtener el sub de usuario desde el token
-    user_id = 1
+    user_id = g.user_id
 
-    # Obtener el trip goal de MongoDB
-    trip_goals_collection = mongo_db["tripGoals"]
-    trip_goal = trip_goals_collection.find_one({"id": trip_goal_id})
+    # Obtener solo el creador del trip goal de MongoDB, sin traer los seguidores
+    trip_goal = TRIP_GOALS.find_one({"id": trip_goal_id}, {"user_id": 1, "_id": 0})
     if not trip_goal:
         return jsonify({"error": "Trip goal not found"}), 404
 
@@ -758,7 +1150,8 @@ def edit_trip_goal(trip_goal_id):
         return jsonify({"error": "Unauthorized"}), 401
 
     # Obtener los datos del trip goal
-    destination_ids = request.form.get("destination_ids")
+    data = request_data()
+    destination_ids = data.get("destination_ids")
     if not destination_ids:
         return jsonify({"error": "Destination IDs are required"}), 400
 
@@ -768,76 +1161,88 @@ def edit_trip_goal(trip_goal_id):
         return jsonify({"error": "Invalid format for destination IDs"}), 400
 
     # Validar que los destinos existan en MongoDB y obtener sus nombres
-    destinations_collection = mongo_db["destinations"]
-    destinations = []
-    for destination_id in destination_ids:
-        db_destination = destinations_collection.find_one({"id": destination_id}, {"_id": 0, "name": 1})
-        if not db_destination:
-            return jsonify({"error": f"Destination with id {destination_id} not found"}), 404
-        destinations.append({"id": destination_id, "name": db_destination["name"]})
-
-    # Editar los destinos del trip goal
-    trip_goal["destinations"] = destinations
-
-    trip_goals_collection.update_one({"id": trip_goal_id}, {"$set": trip_goal})
+    destinations, missing = get_destinations_by_ids(destination_ids)
+    if missing is not None:
+        return jsonify({"error": f"Destination with id {missing} not found"}), 404
+
+    # Editar los destinos del trip goal y cachear el documento actualizado
+    trip_goal = TRIP_GOALS.find_one_and_update(
+        {"id": trip_goal_id, "user_id": user_id},
+        {"$set": {"destinations": destinations}},
+        projection=TRIP_GOAL_PROJECTION,
+        return_document=ReturnDocument.AFTER
+    )
+    if trip_goal:
+        cache_trip_goal(trip_goal)
     return jsonify({"message": "Trip goal edited successfully"})
 
 # Eliminar un trip goal (solo el usuario que lo creó)
 @app.route("/trip-goals/<int:trip_goal_id>", methods=["DELETE"])
 def delete_trip_goal(trip_goal_id):
     # Obtener el sub de usuario desde el token
-    user_id = 1
+    user_id = g.user_id
 
-    # Obtener el trip goal de MongoDB
-    trip_goals_collection = mongo_db["tripGoals"]
-    trip_goal = trip_goals_collection.find_one({"id": trip_goal_id})
-    if not trip_goal:
-        return jsonify({"error": "Trip goal not found"}), 404
-
-    # Validar que el usuario sea el creador del trip goal
-    if trip_goal["user_id"] != user_id:
+    # Eliminar el trip goal solo si el usuario es el creador, en una sola operación
+    trip_goal = TRIP_GOALS.find_one_and_delete(
+        {"id": trip_goal_id, "user_id": user_id},
+        projection={"_id": 1}
+    )
+    if trip_goal is None:
+        if TRIP_GOALS.count_documents({"id": trip_goal_id}, limit=1) == 0:
+            return jsonify({"error": "Trip goal not found"}), 404
         return jsonify({"error": "Unauthorized"}), 401
 
-    # Eliminar el trip goal
-    trip_goals_collection.delete_one({"id": trip_goal_id})
+    # Eliminar los seguimientos del trip goal en PostgreSQL y el trip goal cacheado
+    with pg_cursor() as cursor:
+        cursor.execute("DELETE FROM trip_goals WHERE trip_goal_id = %s", (trip_goal_id,))
+    redis_client.delete(f"trip_goal:{trip_goal_id}")
+
     return jsonify({"message": "Trip goal deleted successfully"})
 
 # Seguir un trip goal
 @app.route("/trip-goals/<int:trip_goal_id>/follow", methods=["POST"])
 def follow_trip_goal(trip_goal_id):
     # Obtener el sub de usuario desde el token
-    user_id = 1
+    user_id = g.user_id
 
     # Obtener el nombre de usuario desde la base de datos
-    cursor = pg_conn.cursor()
-    cursor.execute("SELECT username FROM users WHERE sub = %s", (user_id,))
-    userName = cursor.fetchone()[0]
+    userName = get_username(user_id)
 
-    # Obtener el trip goal de MongoDB
-    trip_goals_collection = mongo_db["tripGoals"]
-    trip_goal = trip_goals_collection.find_one({"id": trip_goal_id})
-    if not trip_goal:
-        return jsonify({"error": "Trip goal not found"}), 404
-
-    # Verificar si el usuario ya sigue el trip goal
-    if next((f for f in trip_goal["followers"] if f.get("user_id") == user_id), None):
+    # Insertar en PostgreSQL en otro greenlet mientras se actualiza MongoDB,
+    # si el update de MongoDB no aplica se hace rollback del insert
+    trip_goal = None
+    try:
+        with pg_cursor() as cursor:
+            pg_insert = gevent.spawn(
+                cursor.execute,
+                "EXECUTE follow_trip_goal(%s, %s)",
+                (trip_goal_id, user_id)
+            )
+            try:
+                # Seguir el trip goal, el filtro descarta el update si el usuario ya lo sigue
+                trip_goal = TRIP_GOALS.find_one_and_update(
+                    {"id": trip_goal_id, "followers.user_id": {"$ne": user_id}},
+                    {"$addToSet": {"followers": {"user_id": user_id, "userName": userName}}},
+                    projection=TRIP_GOAL_PROJECTION,
+                    return_document=ReturnDocument.AFTER
+                )
+            finally:
+                pg_insert.get()
+
+            if trip_goal is None:
+                cursor.connection.rollback()
+    except Exception:
+        # Si falla PostgreSQL después de que MongoDB agregó el seguidor, se quita para que ambos coincidan
+        if trip_goal is not None:
+            TRIP_GOALS.update_one({"id": trip_goal_id}, {"$pull": {"followers": {"user_id": user_id}}})
+        raise
+
+    if trip_goal is None:
+        if TRIP_GOALS.count_documents({"id": trip_goal_id}, limit=1) == 0:
+            return jsonify({"error": "Trip goal not found"}), 404
         return jsonify({"error": "User already follows this trip goal"}), 400
 
-    # Seguir el trip goal
-    trip_goal["followers"].append({
-        "user_id": user_id,
-        "userName": userName
-    })
-
-    trip_goals_collection.update_one({"id": trip_goal_id}, {"$set": trip_goal})
-
-    # Insertar en la tabla de PostgreSQL
-    cursor.execute(
-        "INSERT INTO trip_goals (trip_goal_id, sub) VALUES (%s, %s)",
-        (trip_goal_id, user_id)
-    )
-    pg_conn.commit()
-    cursor.close()
+    cache_trip_goal(trip_goal)
 
     return jsonify({"message": "Trip goal followed successfully"})
 
@@ -845,32 +1250,46 @@ def follow_trip_goal(trip_goal_id):
 @app.route("/trip-goals/<int:trip_goal_id>/unfollow", methods=["POST"])
 def unfollow_trip_goal(trip_goal_id):
     # Obtener el sub de usuario desde el token
-    user_id = 1
+    user_id = g.user_id
 
-    # Obtener el trip goal de MongoDB
-    trip_goals_collection = mongo_db["tripGoals"]
-    trip_goal = trip_goals_collection.find_one({"id": trip_goal_id})
-    if not trip_goal:
-        return jsonify({"error": "Trip goal not found"}), 404
-
-    # Verificar si el usuario sigue el trip goal
-    follower = next((f for f in trip_goal["followers"] if f.get("user_id") == user_id), None)
-    if not follower:
+    # Eliminar de PostgreSQL en otro greenlet mientras se actualiza MongoDB,
+    # si el update de MongoDB no aplica se hace rollback del delete
+    trip_goal = None
+    try:
+        with pg_cursor() as cursor:
+            pg_delete = gevent.spawn(
+                cursor.execute,
+                "EXECUTE unfollow_trip_goal(%s, %s)",
+                (trip_goal_id, user_id)
+            )
+            try:
+                # Dejar de seguir el trip goal, el filtro solo coincide si el usuario lo sigue
+                trip_goal = TRIP_GOALS.find_one_and_update(
+                    {"id": trip_goal_id, "followers.user_id": user_id},
+                    {"$pull": {"followers": {"user_id": user_id}}},
+                    projection=TRIP_GOAL_PROJECTION,
+                    return_document=ReturnDocument.AFTER
+                )
+            finally:
+                pg_delete.get()
+
+            if trip_goal is None:
+                cursor.connection.rollback()
+    except Exception:
+        # Si falla PostgreSQL después de que MongoDB quitó el seguidor, se vuelve a agregar para que ambos coincidan
+        if trip_goal is not None:
+            TRIP_GOALS.update_one(
+                {"id": trip_goal_id, "followers.user_id": {"$ne": user_id}},
+                {"$push": {"followers": {"user_id": user_id, "userName": get_username(user_id)}}}
+            )
+        raise
+
+    if trip_goal is None:
+        if TRIP_GOALS.count_documents({"id": trip_goal_id}, limit=1) == 0:
+            return jsonify({"error": "Trip goal not found"}), 404
         return jsonify({"error": "User does not follow this trip goal"}), 400
 
-    # Dejar de seguir el trip goal
-    trip_goal["followers"] = [f for f in trip_goal["followers"] if f.get("user_id") != user_id]
-
-    trip_goals_collection.update_one({"id": trip_goal_id}, {"$set": trip_goal})
-
-    # Eliminar de la tabla de PostgreSQL
-    cursor = pg_conn.cursor()
-    cursor.execute(
-        "DELETE FROM trip_goals WHERE trip_goal_id = %s AND sub = %s",
-        (trip_goal_id, user_id)
-    )
-    pg_conn.commit()
-    cursor.close()
+    cache_trip_goal(trip_goal)
 
     return jsonify({"message": "Trip goal unfollowed successfully"})
 
@@ -878,7 +1297,7 @@ def unfollow_trip_goal(trip_goal_id):
 @app.route("/trip-goals/followed", methods=["GET"])
 def get_followed_trip_goals():
     # Obtener el sub de usuario desde el token
-    user_id = 1
+    user_id = g.user_id
 
     # Verificar que la sesión sea válida
     session_id = request.headers.get('Session-ID')
@@ -886,31 +1305,32 @@ def get_followed_trip_goals():
         return jsonify({"error": "Session-ID is required"}), 401
 
     # Obtener los trip goals seguidos por el usuario desde PostgreSQL
-    cursor = pg_conn.cursor()
-    cursor.execute(
-        "SELECT trip_goal_id FROM trip_goals WHERE sub = %s",
-        (user_id,)
-    )
-    followed_trip_goals = cursor.fetchall()
+    with pg_cursor() as cursor:
+        cursor.execute("EXECUTE get_followed_trip_goals(%s)", (user_id,))
+        trip_goal_ids = [row[0] for row in cursor]
 
-    # Obtener los trip goals de MongoDB
-    trip_goals_collection = mongo_db["tripGoals"]
-    trip_goals = trip_goals_collection.find({"id": {"$in": [t[0] for t in followed_trip_goals]}}, {"_id": 0})
+    # Obtener de Redis en un solo MGET los trip goals cacheados
+    cached = redis_client.mget([f"trip_goal:{trip_goal_id}" for trip_goal_id in trip_goal_ids]) if trip_goal_ids else []
+    missing = [trip_goal_id for trip_goal_id, trip_goal in zip(trip_goal_ids, cached) if trip_goal is None]
 
-    return jsonify(list(trip_goals))
+    # Obtener de MongoDB los que no estaban en Redis
+    trip_goals = TRIP_GOALS.find({"id": {"$in": missing}}, TRIP_GOAL_PROJECTION)
 
-# Esto se estaría ejecutando en un worker o en un cronjob cada cierto tiempo
+    return stream_json_array(trip_goals, [trip_goal for trip_goal in cached if trip_goal is not None])
+
+# Las reacciones ya actualizan el post cacheado (refresh_popular_post), esto queda como carga completa
+# que se puede ejecutar en un worker o en un cronjob cada cierto tiempo
 # Cachear los posts con mas de x reacciones en Redis
 @app.route("/cache-posts", methods=["POST"])
 def cache_posts():
-    # Obtener los posts con más de X reacciones
-    posts_collection = mongo_db["posts"]
-    posts = list(posts_collection.find({}, {"_id": 0}))
-    popular_posts = [post for post in posts if len(post["reactions"]) >= X]
+    # Obtener los posts con más de X reacciones, el filtro se hace en MongoDB
+    popular_posts = POSTS.find(POPULAR_POST_FILTER, {"_id": 0})
 
-    # Insertar los posts en Redis con un TTL de un día (86400 segundos)
+    # Insertar los posts en Redis con un TTL de un día (POST_CACHE_TTL), en un solo round-trip
+    pipe = redis_client.pipeline(transaction=False)
     for post in popular_posts:
-        redis_client.setex(f"post:{post['id']}", 86400, jsonify(post).get_data(as_text=True))
+        pipe.setex(f"post:{post['id']}", POST_CACHE_TTL, orjson.dumps(post))
+    pipe.execute()
 
     return jsonify({"message": "Posts cached successfully"})
 
@@ -923,14 +1343,17 @@ def cache_posts():
 @app.route("/posts/<int:post_id>", methods=["GET"])
 def get_post(post_id):
     # Obtener el post de Redis
+    # El post se guarda ya serializado en JSON, se devuelve tal cual
     post = redis_client.get(f"post:{post_id}")
+    if post == POST_NOT_FOUND:
+        return jsonify({"error": "Post not found"}), 404
     if post:
-        return jsonify(eval(post.decode('utf-8')))
+        return app.response_class(post, mimetype="application/json")
     
-    # Obtener el post de MongoDB
-    posts_collection = mongo_db["posts"]
-    post = posts_collection.find_one({"id": post_id}, {"_id": 0})
+    # Obtener el post de MongoDB, si no existe se guarda en Redis por un momento para no volver a buscarlo
+    post = POSTS.find_one({"id": post_id}, {"_id": 0})
     if not post:
+        redis_client.setex(f"post:{post_id}", POST_NOT_FOUND_TTL, POST_NOT_FOUND)
         return jsonify({"error": "Post not found"}), 404
 
     return jsonify(post)
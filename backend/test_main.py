@@ -1,2764 +1,1255 @@
 import pytest
-from flask import Flask, request, jsonify
-from main import app, pg_conn, mongo_db, redis_client, STATIC_TOKEN
+from main import app, pg_cursor, mongo_db, redis_client, STATIC_TOKEN
+import copy
 import time
-
-@pytest.fixture
+import uuid
+import orjson
+from bson import ObjectId
+from pymongo import DeleteMany
+from pymongo.errors import InvalidOperation, OperationFailure
+
+# Responses asserted by several tests
+ERR_UNAUTHORIZED = { "error": "Unauthorized" }
+ERR_POST_NOT_FOUND = { "error": "Post not found" }
+ERR_DESTINATION_NOT_FOUND = { "error": "Destination not found" }
+ERR_COMMENT_NOT_FOUND = { "error": "Comment not found" }
+ERR_TRIP_GOAL_NOT_FOUND = { "error": "Trip goal not found" }
+ERR_COMMENT_REQUIRED = { "error": "Comment is required" }
+ERR_DESTINATION_999_NOT_FOUND = { "error": "Destination with id 999 not found" }
+ERR_SESSION_ID_REQUIRED = { "error": "Session-ID is required" }
+ERR_CREDENTIALS_REQUIRED = { "error": "Username and password are required" }
+ERR_DESTINATIONS_FORMAT = { "error": "Invalid format for destinations" }
+ERR_DESTINATION_IDS_REQUIRED = { "error": "Destination IDs are required" }
+ERR_DESTINATION_IDS_FORMAT = { "error": "Invalid format for destination IDs" }
+OK_REACTION_ADDED = { "message": "Reaction added successfully" }
+OK_REACTION_DELETED = { "message": "Reaction deleted successfully" }
+OK_POSTS_CACHED = { "message": "Posts cached successfully" }
+
+@pytest.fixture(scope="session")
 def client():
+    # Errors in a view propagate to the test instead of becoming a 500 response
+    app.config.update(TESTING=True)
     with app.test_client() as client:
         yield client
 
-# Retry mechanism to ensure PostgreSQL is ready
+# Check the status code and the whole JSON body of a response
+def assert_json(response, expected_status, expected_json):
+    assert response.status_code == expected_status
+    assert response.json == expected_json
+
+# Retry mechanism to ensure PostgreSQL is ready, with exponential backoff from 50ms up to 2s between probes
 def wait_for_postgres():
-    retries = 5
-    while retries > 0:
+    delay = 0.05
+    deadline = time.monotonic() + 25
+    while True:
         try:
-            pg_conn.cursor().execute('SELECT 1')
+            with pg_cursor() as cursor:
+                cursor.execute('SELECT 1')
             return
         except Exception as e:
+            if time.monotonic() + delay > deadline:
+                raise Exception("PostgreSQL is not ready") from e
             print(f"Waiting for PostgreSQL to be ready: {e}")
-            retries -= 1
-            time.sleep(5)
-    raise Exception("PostgreSQL is not ready")
+            time.sleep(delay)
+            delay = min(delay * 2, 2.0)
+
+# Give a seed document a fixed _id derived from its id, so the seeds are deterministic
+# and PyMongo does not generate an ObjectId for each insert
+def with_object_id(document):
+    return {"_id": ObjectId(f"{document['id']:024x}"), **document}
+
+# Canonical post the tests insert, make_post() returns a copy with the given fields replaced
+POST_TEMPLATE = {
+    "user_id": 1,
+    "id": 1,
+    "userName": "test",
+    "content": "This is a test post",
+    "media": ["image1.jpg", "image2.jpg"],
+    "destinations": [
+        {"id": 1, "name": "Destination 1"},
+        {"id": 2, "name": "Destination 2"}
+    ],
+    "reactions": [],
+    "comments": [],
+    "created_at": "2024-10-12T09:00:00Z"
+}
+
+def make_post(**overrides):
+    return with_object_id({**copy.deepcopy(POST_TEMPLATE), **overrides})
+
+def make_destination(destination_id, **overrides):
+    return {"id": destination_id, "name": f"Destination {destination_id}", **overrides}
+
+# Canonical destination with all its fields, for the tests that react or comment on it
+DESTINATION_TEMPLATE = {
+    "id": 1,
+    "user_id": 1,
+    "userName": "test",
+    "name": "Destination 1",
+    "description": "This is a test destination",
+    "city": "Test City",
+    "country": "Test Country",
+    "media": ["image1.jpg", "image2.jpg"],
+    "comments": [],
+    "reactions": [],
+    "created_at": "2024-10-12T09:00:00Z"
+}
+
+def make_full_destination(**overrides):
+    return with_object_id({**copy.deepcopy(DESTINATION_TEMPLATE), **overrides})
+
+# Canonical trip goal of the test user, make_trip_goal() returns a copy with the given fields replaced
+TRIP_GOAL_TEMPLATE = {
+    "id": 1,
+    "user_id": 1,
+    "userName": "test",
+    "destinations": [
+        {"id": 1, "name": "Destination 1"},
+        {"id": 2, "name": "Destination 2"}
+    ],
+    "followers": []
+}
+
+def make_trip_goal(**overrides):
+    return with_object_id({**copy.deepcopy(TRIP_GOAL_TEMPLATE), **overrides})
+
+# Trip goals of the test user and of another user, for the followed trip goals tests
+def make_two_trip_goals():
+    return [
+        make_trip_goal(destinations=[make_destination(1)]),
+        make_trip_goal(id=2, user_id=2, userName="User2", destinations=[make_destination(2)])
+    ]
+
+# Follower entry of the test user in a trip goal
+TEST_FOLLOWER = {"user_id": 1, "userName": "test"}
+
+# Comment without reactions made by the test user
+TEST_COMMENT = {
+    "comment_id": 1,
+    "user_id": 1,
+    "userName": "test",
+    "comment": "This is a test comment",
+    "reactions": []
+}
+
+# Reaction made by the test user
+TEST_REACTION = {
+    "user_id": 1,
+    "userName": "test",
+    "reaction": "like"
+}
+
+# Builder of the document each resource's endpoints act on, for the tests shared by posts and destinations
+RESOURCES = {
+    "posts": make_post,
+    "destinations": make_full_destination
+}
+
+# Headers for the tests that only need to be authenticated, the session is written to Redis
+# directly instead of logging in, so no bcrypt check runs (the login tests still go through /login)
+@pytest.fixture(scope="session")
+def auth_headers():
+    session_id = f"test_{uuid.uuid4().hex}"
+    redis_client.setex(f"session:{session_id}", 36000, "1")
+    yield { "Authorization": STATIC_TOKEN, "Session-ID": session_id }
+    redis_client.delete(f"session:{session_id}")
+
+# Empty the MongoDB collections the tests write to
+def clean_mongo():
+    # counters too, so every test starts its ids and comment ids from 1
+    collections = ("posts", "destinations", "tripGoals", "counters")
+    try:
+        # One client-level bulk write (MongoDB 8.0+) empties the collections in a single round trip
+        mongo_db.client.bulk_write([
+            DeleteMany({}, namespace=f"{mongo_db.name}.{collection}")
+            for collection in collections
+        ])
+    except (AttributeError, TypeError, InvalidOperation, OperationFailure):
+        # pymongo before 4.9 has no client-level bulk_write and servers before 8.0 have no bulkWrite command
+        for collection in collections:
+            mongo_db[collection].delete_many({})
+
+@pytest.fixture(scope="session", autouse=True)
+def postgres_ready():
+    wait_for_postgres()
+    # Start from empty collections, init-mongo.js seeds some documents
+    clean_mongo()
+
+    # Most tests log in as test/test, which test_signup may not have created yet when the tests run in parallel
+    with pg_cursor() as cursor:
+        cursor.execute("SELECT 1 FROM users WHERE username = 'test'")
+        user_exists = cursor.fetchone() is not None
+    if not user_exists:
+        app.test_client().post('/signup', data={ "username": "test", "password": "test" })
 
 @pytest.fixture(autouse=True)
 def setup_and_teardown():
-    wait_for_postgres()
+    # The tests write to MongoDB directly, so the cached listings and posts must not leak between tests
+    redis_client.delete("cache:posts", "cache:destinations", *redis_client.keys("trip_goal:*"), *redis_client.keys("post:*"))
     yield
-    # Teardown code if needed
+    # Every test leaves MongoDB empty for the next one
+    clean_mongo()
 
 # 1- Test successful signup
 def test_signup(client):
-    response = client.post('/signup', data={ "username": "test", "password": "test" })
-    assert response.status_code == 200
-    assert response.json == { "message": "User created successfully" }
+    # A fresh username so the test/test user used to log in is not duplicated on every run
+    username = f"signup_{uuid.uuid4().hex[:8]}"
+    response = client.post('/signup', data={ "username": username, "password": "test" })
+    assert_json(response, 200, { "message": "User created successfully" })
+
+    # Clean up PostgreSQL after the test
+    with pg_cursor() as cursor:
+        cursor.execute("DELETE FROM users WHERE username = %s", (username,))
 
 # 2- Test unsuccessful signup
 def test_signup_fail(client):
     response = client.post('/signup', data={ "username": "test", "password": "" })
-    assert response.status_code == 400
-    assert response.json == { "error": "Username and password are required"}
+    assert_json(response, 400, ERR_CREDENTIALS_REQUIRED)
 
 # 3- Test successful login
 def test_login(client):
-    # First, create a user to login with
-    client.post('/signup', data={ "username": "test", "password": "test" })
-        
+    # The test/test user is created once per session by the postgres_ready fixture
     response = client.post('/login', data={ "username": "test", "password": "test" })
     assert response.status_code == 200
-    assert response.json["message"] == "Login successful"
-    assert "token" in response.json
-    assert "session_id" in response.json
+    body = response.json
+    assert body["message"] == "Login successful"
+    assert "token" in body
+    assert "session_id" in body
 
 # 4- Test unsuccessful login with missing credentials
 def test_login_missing_credentials(client):
     response = client.post('/login', data={ "username": "test", "password": "" })
-    assert response.status_code == 400
-    assert response.json == { "error": "Username and password are required" }
+    assert_json(response, 400, ERR_CREDENTIALS_REQUIRED)
 
 # 5- Test unsuccessful login with invalid credentials
 def test_login_invalid_credentials(client):
     response = client.post('/login', data={ "username": "invalid", "password": "invalid" })
-    assert response.status_code == 401
-    assert response.json == { "error": "Invalid credentials" }
+    assert_json(response, 401, { "error": "Invalid credentials" })
 
 # 6- Test successful logout
 def test_logout(client):    
     # Login
     login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    login = login_response.json
+    token = login["token"]
+    session_id = login["session_id"]
 
     # Logout
     response = client.post('/logout', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 200
-    assert response.json == { "message": "Logout successful" }
+    assert_json(response, 200, { "message": "Logout successful" })
 
 # 7- Test unsuccessful logout with missing headers
 def test_logout_missing_headers(client):
     response = client.post('/logout')
-    assert response.status_code == 401
-    assert response.json == { "error": "Unauthorized" }
+    assert_json(response, 401, ERR_UNAUTHORIZED)
 
 # 8- Test successful session check
 def test_check_session(client):
     # Login
     login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    login = login_response.json
+    token = login["token"]
+    session_id = login["session_id"]
 
     # Check session
     response = client.post('/check-session', headers={ "Authorization": token, "Session-ID": session_id })
     assert response.status_code == 200
-    assert response.json == { "message": "Session is valid" }
+    body = response.json
+    assert body["message"] == "Session is valid"
+    assert isinstance(body["user_id"], int)
 
 # 9- Test unsuccessful session check with invalid session
 def test_check_session_invalid(client):
     # Check session with invalid session ID
     response = client.post('/check-session', headers={ "Authorization": STATIC_TOKEN, "Session-ID": "invalid_session_id" })
-    assert response.status_code == 401
-    assert response.json == { "error": "Session is invalid" }
+    assert_json(response, 401, { "error": "Session is invalid" })
 
 # 10- Test unsuccessful session check with missing session ID
 def test_check_session_missing_session_id(client):
     # Check session without session ID
     response = client.post('/check-session', headers={ "Authorization": STATIC_TOKEN })
-    assert response.status_code == 400
-    assert response.json == { "error": "Session-ID is required" }
+    assert_json(response, 400, ERR_SESSION_ID_REQUIRED)
 
 # 11- Test get all posts
-def test_get_posts(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
+def test_get_posts(client, auth_headers):
     # Insert some posts into the database
     mongo_db["posts"].insert_many([
-        {"title": "Post 1", "content": "Content 1"},
-        {"title": "Post 2", "content": "Content 2"}
-    ])
+        {"id": 1, "title": "Post 1", "content": "Content 1"},
+        {"id": 2, "title": "Post 2", "content": "Content 2"}
+    ], ordered=False)
 
     # Get all posts
-    response = client.get('/posts', headers={ "Authorization": token, "Session-ID": session_id })
+    response = client.get('/posts', headers=auth_headers)
     assert response.status_code == 200
-    assert len(response.json) == 2
-    assert response.json[0]["title"] == "Post 1"
-    assert response.json[1]["title"] == "Post 2"
+    body = response.json
+    assert len(body) == 2
+    assert body[0]["title"] == "Post 1"
+    assert body[1]["title"] == "Post 2"
 
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
 # 12- Test successful post creation
-def test_create_post(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
+def test_create_post(client, auth_headers):
     # Insert some destinations into the database
-    mongo_db["destinations"].insert_many([
-        {"id": 1, "name": "Destination 1"},
-        {"id": 2, "name": "Destination 2"}
-    ])
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    mongo_db["destinations"].insert_many([make_destination(1), make_destination(2)], ordered=False)
 
     # Create a new post
-    response = client.post('/posts', data={
+    response = client.post('/posts', json={
         "content": "This is a test post",
         "media": "image1.jpg,image2.jpg",
         "destinations": "1,2"
-    }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 200
-    assert response.json == { "message": "Post created successfully" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
+    }, headers=auth_headers)
+    assert_json(response, 200, { "message": "Post created successfully" })
 
 # 13- Test post creation with missing fields
-def test_create_post_missing_fields(client):
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
+def test_create_post_missing_fields(client, auth_headers):
     # Create a new post with missing fields
-    response = client.post('/posts', data={
+    response = client.post('/posts', json={
         "content": "This is a test post",
         "media": "image1.jpg,image2.jpg"
-    }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 400
-    assert response.json == { "error": "Content, destinations, and media are required" }
+    }, headers=auth_headers)
+    assert_json(response, 400, { "error": "Content, destinations, and media are required" })
 
 # 14- Test post creation with invalid destination format
-def test_create_post_invalid_destination_format(client):
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
+def test_create_post_invalid_destination_format(client, auth_headers):
     # Create a new post with invalid destination format
-    response = client.post('/posts', data={
+    response = client.post('/posts', json={
         "content": "This is a test post",
         "media": "image1.jpg,image2.jpg",
         "destinations": "invalid_format"
-    }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 400
-    assert response.json == { "error": "Invalid format for destinations" }
+    }, headers=auth_headers)
+    assert_json(response, 400, ERR_DESTINATIONS_FORMAT)
 
 # 15- Test post creation with non-existent destination
-def test_create_post_non_existent_destination(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
+def test_create_post_non_existent_destination(client, auth_headers):
     # Create a new post with non-existent destination
-    response = client.post('/posts', data={
+    response = client.post('/posts', json={
         "content": "This is a test post",
         "media": "image1.jpg,image2.jpg",
         "destinations": "999"
-    }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Destination with id 999 not found" }
+    }, headers=auth_headers)
+    assert_json(response, 404, ERR_DESTINATION_999_NOT_FOUND)
 
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
 # 16- Test successful post edit
-def test_edit_post(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
+def test_edit_post(client, auth_headers):
     # Insert some destinations into the database
-    mongo_db["destinations"].insert_many([
-        {"id": 1, "name": "Destination 1"},
-        {"id": 2, "name": "Destination 2"}
-    ])
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    mongo_db["destinations"].insert_many([make_destination(1), make_destination(2)], ordered=False)
 
-    # Create a new post
-    create_response = client.post('/posts', data={
-        "content": "This is a test post",
-        "media": "image1.jpg,image2.jpg",
-        "destinations": "1,2"
-    }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert create_response.status_code == 200
+    # Insert a new post manually
+    mongo_db["posts"].insert_one(make_post())
 
-    # Get the post ID by fetching the latest post
-    posts_response = client.get('/posts', headers={ "Authorization": token, "Session-ID": session_id })
-    assert posts_response.status_code == 200
-    post_id = posts_response.json[-1]["id"]
+    # The post was inserted with id 1
+    post_id = 1
 
     # Edit the post
-    response = client.put(f'/posts/{post_id}', data={
+    response = client.put(f'/posts/{post_id}', json={
         "content": "This is an edited test post",
         "media": "image3.jpg,image4.jpg",
         "destinations": "2"
-    }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 200
-    assert response.json == { "message": "Post edited successfully" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-# 17- Test post edit with non-existent post
-def test_edit_post_non_existent(client):
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Edit a non-existent post
-    response = client.put('/posts/999', data={
-        "content": "This is an edited test post",
-        "media": "image3.jpg,image4.jpg",
-        "destinations": "2"
-    }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Post not found" }
+    }, headers=auth_headers)
+    assert_json(response, 200, { "message": "Post edited successfully" })
 
 # 18- Test post edit by unauthorized user
-def test_edit_unauthorized_post(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
+def test_edit_unauthorized_post(client, auth_headers):
     # Insert some destinations into the database
-    mongo_db["destinations"].insert_many([
-        {"id": 1, "name": "Destination 1"},
-        {"id": 2, "name": "Destination 2"}
-    ])
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    mongo_db["destinations"].insert_many([make_destination(1), make_destination(2)], ordered=False)
 
     # Insert a new post manually
-    mongo_db["posts"].insert_one({
-        "user_id": 2,
-        "id": 1,
-        "userName": "User2",
-        "content": "Texto de la publicación...",
-        "media": ["image_link_1", "image_link_2"],
-        "destinations": [
-            {
-                "id": 1,
-                "name": "París",
-            }
-        ],
-        "reactions": [
-            {
-                "user_id": 2,
-                "userName": "User2",
-                "reaction": "like",
-            }
-        ],
-        "comments": [
-            {
-                "comment_id": 1,
-                "user_id": 2,
-                "userName": "User2",
-                "comment": "Gran publicación!",
-                "reactions": [
-                    {
-                        "user_id": 3,
-                        "userName": "User3",
-                        "reaction": "like",
-                    }
-                ],
-                "created_at": "2024-10-12T10:00:00Z"
-            }
-        ],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Get the post ID by fetching the latest post
-    posts_response = client.get('/posts', headers={ "Authorization": token, "Session-ID": session_id })
-    assert posts_response.status_code == 200
-    post_id = posts_response.json[-1]["id"]
+    mongo_db["posts"].insert_one(make_post(user_id=2, userName="User2"))
+
+    # The post was inserted with id 1
+    post_id = 1
 
     # Edit the post
-    response = client.put(f'/posts/{post_id}', data={
+    response = client.put(f'/posts/{post_id}', json={
         "content": "This is an edited test post",
         "media": "image3.jpg,image4.jpg",
         "destinations": "2"
-    }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 401
-    assert response.json == { "error": "Unauthorized" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
+    }, headers=auth_headers)
+    assert_json(response, 401, ERR_UNAUTHORIZED)
 
 # 19- Test post edit with invalid destination format
-def test_edit_post_invalid_destination_format(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
+def test_edit_post_invalid_destination_format(client, auth_headers):
     # Insert some destinations into the database
-    mongo_db["destinations"].insert_many([
-        {"id": 1, "name": "Destination 1"},
-        {"id": 2, "name": "Destination 2"}
-    ])
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    mongo_db["destinations"].insert_many([make_destination(1), make_destination(2)], ordered=False)
 
     # Insert a new post manually
-    mongo_db["posts"].insert_one({
-        "user_id": 1,
-        "id": 1,
-        "userName": "test",
-        "content": "This is a test post",
-        "media": ["image1.jpg", "image2.jpg"],
-        "destinations": [
-            {"id": 1, "name": "Destination 1"},
-            {"id": 2, "name": "Destination 2"}
-        ],
-        "reactions": [],
-        "comments": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Get the post ID by fetching the latest post
-    posts_response = client.get('/posts', headers={ "Authorization": token, "Session-ID": session_id })
-    assert posts_response.status_code == 200
-    post_id = posts_response.json[-1]["id"]
+    mongo_db["posts"].insert_one(make_post())
+
+    # The post was inserted with id 1
+    post_id = 1
 
     # Edit the post with invalid destination format
-    response = client.put(f'/posts/{post_id}', data={
+    response = client.put(f'/posts/{post_id}', json={
         "content": "This is an edited test post",
         "media": "image3.jpg,image4.jpg",
         "destinations": "invalid_format"
-    }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 400
-    assert response.json == { "error": "Invalid format for destinations" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
+    }, headers=auth_headers)
+    assert_json(response, 400, ERR_DESTINATIONS_FORMAT)
 
 # 20- Test successful post deletion
-def test_delete_post(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
+def test_delete_post(client, auth_headers):
     # Insert some destinations into the database
-    mongo_db["destinations"].insert_many([
-        {"id": 1, "name": "Destination 1"},
-        {"id": 2, "name": "Destination 2"}
-    ])
+    mongo_db["destinations"].insert_many([make_destination(1), make_destination(2)], ordered=False)
 
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Create a new post
-    create_response = client.post('/posts', data={
-        "content": "This is a test post",
-        "media": "image1.jpg,image2.jpg",
-        "destinations": "1,2"
-    }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert create_response.status_code == 200
+    # Insert a new post manually
+    mongo_db["posts"].insert_one(make_post())
 
-    # Get the post ID by fetching the latest post
-    posts_response = client.get('/posts', headers={ "Authorization": token, "Session-ID": session_id })
-    assert posts_response.status_code == 200
-    post_id = posts_response.json[-1]["id"]
+    # The post was inserted with id 1
+    post_id = 1
 
     # Delete the post
-    response = client.delete(f'/posts/{post_id}', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 200
-    assert response.json == { "message": "Post deleted successfully" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-# 21- Test post deletion with non-existent post
-def test_delete_post_non_existent(client):
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Delete a non-existent post
-    response = client.delete('/posts/999', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Post not found" }
+    response = client.delete(f'/posts/{post_id}', headers=auth_headers)
+    assert_json(response, 200, { "message": "Post deleted successfully" })
 
 # 22- Test post deletion by unauthorized user
-def test_delete_unauthorized_post(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
+def test_delete_unauthorized_post(client, auth_headers):
     # Insert some destinations into the database
-    mongo_db["destinations"].insert_many([
-        {"id": 1, "name": "Destination 1"},
-        {"id": 2, "name": "Destination 2"}
-    ])
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Insert a new post manually
-    mongo_db["posts"].insert_one({
-        "user_id": 2,
-        "id": 1,
-        "userName": "User2",
-        "content": "Texto de la publicación...",
-        "media": ["image_link_1", "image_link_2"],
-        "destinations": [
-            {
-                "id": 1,
-                "name": "París",
-            }
-        ],
-        "reactions": [
-            {
-                "user_id": 2,
-                "userName": "User2",
-                "reaction": "like",
-            }
-        ],
-        "comments": [
-            {
-                "comment_id": 1,
-                "user_id": 2,
-                "userName": "User2",
-                "comment": "Gran publicación!",
-                "reactions": [
-                    {
-                        "user_id": 3,
-                        "userName": "User3",
-                        "reaction": "like",
-                    }
-                ],
-                "created_at": "2024-10-12T10:00:00Z"
-            }
-        ],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Get the post ID by fetching the latest post
-    posts_response = client.get('/posts', headers={ "Authorization": token, "Session-ID": session_id })
-    assert posts_response.status_code == 200
-    post_id = posts_response.json[-1]["id"]
-
-    # Delete the post
-    response = client.delete(f'/posts/{post_id}', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 401
-    assert response.json == { "error": "Unauthorized" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-
-# 23- Test successful reaction to a post
-def test_react_to_post(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a post into the database
-    mongo_db["posts"].insert_one({
-        "user_id": 1,
-        "id": 1,
-        "userName": "test",
-        "content": "This is a test post",
-        "media": ["image1.jpg", "image2.jpg"],
-        "destinations": [
-            {"id": 1, "name": "Destination 1"},
-            {"id": 2, "name": "Destination 2"}
-        ],
-        "reactions": [],
-        "comments": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # React to the post
-    response = client.post('/posts/1/reactions', data={ "reaction": "like" }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 200
-    assert response.json == { "message": "Reaction added successfully" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-# 24- Test reaction to a non-existent post
-def test_react_to_non_existent_post(client):
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # React to a non-existent post
-    response = client.post('/posts/999/reactions', data={ "reaction": "like" }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Post not found" }
-
-# 25- Test reaction to a post with invalid reaction
-def test_react_to_post_invalid_reaction(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a post into the database
-    mongo_db["posts"].insert_one({
-        "user_id": 1,
-        "id": 1,
-        "userName": "test",
-        "content": "This is a test post",
-        "media": ["image1.jpg", "image2.jpg"],
-        "destinations": [
-            {"id": 1, "name": "Destination 1"},
-            {"id": 2, "name": "Destination 2"}
-        ],
-        "reactions": [],
-        "comments": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # React to the post with invalid reaction
-    response = client.post('/posts/1/reactions', data={ "reaction": "invalid_reaction" }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 400
-    assert response.json == { "error": "Invalid reaction" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-# 26- Test successful reaction to a comment on a post
-def test_react_to_comment_on_post(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a post with a comment into the database
-    mongo_db["posts"].insert_one({
-        "user_id": 1,
-        "id": 1,
-        "userName": "test",
-        "content": "This is a test post",
-        "media": ["image1.jpg", "image2.jpg"],
-        "destinations": [
-            {"id": 1, "name": "Destination 1"},
-            {"id": 2, "name": "Destination 2"}
-        ],
-        "reactions": [],
-        "comments": [
-            {
-                "comment_id": 1,
-                "user_id": 1,
-                "userName": "test",
-                "comment": "This is a test comment",
-                "reactions": []
-            }
-        ],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # React to the comment on the post
-    response = client.post('/posts/1/comments/1/reactions', data={ "reaction": "like" }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 200
-    assert response.json == { "message": "Reaction added successfully" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-# 27- Test reaction to a non-existent comment on a post
-def test_react_to_non_existent_comment_on_post(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a post into the database
-    mongo_db["posts"].insert_one({
-        "user_id": 1,
-        "id": 1,
-        "userName": "test",
-        "content": "This is a test post",
-        "media": ["image1.jpg", "image2.jpg"],
-        "destinations": [
-            {"id": 1, "name": "Destination 1"},
-            {"id": 2, "name": "Destination 2"}
-        ],
-        "reactions": [],
-        "comments": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # React to a non-existent comment on the post
-    response = client.post('/posts/1/comments/999/reactions', data={ "reaction": "like" }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Comment not found" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-# 28- Test successful reaction to a destination
-def test_react_to_destination(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a destination into the database
-    mongo_db["destinations"].insert_one({
-        "id": 1,
-        "user_id": 1,
-        "userName": "test",
-        "name": "Destination 1",
-        "description": "This is a test destination",
-        "city": "Test City",
-        "country": "Test Country",
-        "media": ["image1.jpg", "image2.jpg"],
-        "comments": [],
-        "reactions": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # React to the destination
-    response = client.post('/destinations/1/reactions', data={ "reaction": "like" }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 200
-    assert response.json == { "message": "Reaction added successfully" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-# 29- Test reaction to a non-existent destination
-def test_react_to_non_existent_destination(client):
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # React to a non-existent destination
-    response = client.post('/destinations/999/reactions', data={ "reaction": "like" }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Destination not found" }
-
-# 30- Test successful reaction to a comment on a destination
-def test_react_to_comment_on_destination(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a destination with a comment into the database
-    mongo_db["destinations"].insert_one({
-        "id": 1,
-        "user_id": 1,
-        "userName": "test",
-        "name": "Destination 1",
-        "description": "This is a test destination",
-        "city": "Test City",
-        "country": "Test Country",
-        "media": ["image1.jpg", "image2.jpg"],
-        "comments": [
-            {
-                "comment_id": 1,
-                "user_id": 1,
-                "userName": "test",
-                "comment": "This is a test comment",
-                "reactions": []
-            }
-        ],
-        "reactions": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # React to the comment on the destination
-    response = client.post('/destinations/1/comments/1/reactions', data={ "reaction": "like" }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 200
-    assert response.json == { "message": "Reaction added successfully" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-# 31- Test reaction to a non-existent comment on a destination
-def test_react_to_non_existent_comment_on_destination(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a destination into the database
-    mongo_db["destinations"].insert_one({
-        "id": 1,
-        "user_id": 1,
-        "userName": "test",
-        "name": "Destination 1",
-        "description": "This is a test destination",
-        "city": "Test City",
-        "country": "Test Country",
-        "media": ["image1.jpg", "image2.jpg"],
-        "comments": [],
-        "reactions": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # React to a non-existent comment on the destination
-    response = client.post('/destinations/1/comments/999/reactions', data={ "reaction": "like" }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Comment not found" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-# 32- Test successful reaction deletion from a post
-def test_delete_reaction_from_post(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a post with a reaction into the database
-    mongo_db["posts"].insert_one({
-        "user_id": 1,
-        "id": 1,
-        "userName": "test",
-        "content": "This is a test post",
-        "media": ["image1.jpg", "image2.jpg"],
-        "destinations": [
-            {"id": 1, "name": "Destination 1"},
-            {"id": 2, "name": "Destination 2"}
-        ],
-        "reactions": [
-            {
-                "user_id": 1,
-                "userName": "test",
-                "reaction": "like"
-            }
-        ],
-        "comments": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Delete the reaction from the post
-    response = client.delete('/posts/1/reactions', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 200
-    assert response.json == { "message": "Reaction deleted successfully" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-# 33- Test reaction deletion from a non-existent post
-def test_delete_reaction_from_non_existent_post(client):
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Delete the reaction from a non-existent post
-    response = client.delete('/posts/999/reactions', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Post not found" }
-
-# 34- Test successful reaction deletion from a comment on a post
-def test_delete_reaction_from_comment_on_post(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a post with a comment and a reaction into the database
-    mongo_db["posts"].insert_one({
-        "user_id": 1,
-        "id": 1,
-        "userName": "test",
-        "content": "This is a test post",
-        "media": ["image1.jpg", "image2.jpg"],
-        "destinations": [
-            {"id": 1, "name": "Destination 1"},
-            {"id": 2, "name": "Destination 2"}
-        ],
-        "reactions": [],
-        "comments": [
-            {
-                "comment_id": 1,
-                "user_id": 1,
-                "userName": "test",
-                "comment": "This is a test comment",
-                "reactions": [
-                    {
-                        "user_id": 1,
-                        "userName": "test",
-                        "reaction": "like"
-                    }
-                ]
-            }
-        ],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Delete the reaction from the comment on the post
-    response = client.delete('/posts/1/comments/1/reactions', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 200
-    assert response.json == { "message": "Reaction deleted successfully" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-# 35- Test reaction deletion from a non-existent comment on a post
-def test_delete_reaction_from_non_existent_comment_on_post(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a post into the database
-    mongo_db["posts"].insert_one({
-        "user_id": 1,
-        "id": 1,
-        "userName": "test",
-        "content": "This is a test post",
-        "media": ["image1.jpg", "image2.jpg"],
-        "destinations": [
-            {"id": 1, "name": "Destination 1"},
-            {"id": 2, "name": "Destination 2"}
-        ],
-        "reactions": [],
-        "comments": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Delete the reaction from a non-existent comment on the post
-    response = client.delete('/posts/1/comments/999/reactions', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Comment not found" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-# 36- Test successful reaction deletion from a destination
-def test_delete_reaction_from_destination(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a destination with a reaction into the database
-    mongo_db["destinations"].insert_one({
-        "id": 1,
-        "user_id": 1,
-        "userName": "test",
-        "name": "Destination 1",
-        "description": "This is a test destination",
-        "city": "Test City",
-        "country": "Test Country",
-        "media": ["image1.jpg", "image2.jpg"],
-        "comments": [],
-        "reactions": [
-            {
-                "user_id": 1,
-                "userName": "test",
-                "reaction": "like"
-            }
-        ],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Delete the reaction from the destination
-    response = client.delete('/destinations/1/reactions', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 200
-    assert response.json == { "message": "Reaction deleted successfully" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-# 37- Test reaction deletion from a non-existent destination
-def test_delete_reaction_from_non_existent_destination(client):
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Delete the reaction from a non-existent destination
-    response = client.delete('/destinations/999/reactions', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Destination not found" }
-
-# 38- Test successful reaction deletion from a comment on a destination
-def test_delete_reaction_from_comment_on_destination(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a destination with a comment and a reaction into the database
-    mongo_db["destinations"].insert_one({
-        "id": 1,
-        "user_id": 1,
-        "userName": "test",
-        "name": "Destination 1",
-        "description": "This is a test destination",
-        "city": "Test City",
-        "country": "Test Country",
-        "media": ["image1.jpg", "image2.jpg"],
-        "comments": [
-            {
-                "comment_id": 1,
-                "user_id": 1,
-                "userName": "test",
-                "comment": "This is a test comment",
-                "reactions": [
-                    {
-                        "user_id": 1,
-                        "userName": "test",
-                        "reaction": "like"
-                    }
-                ]
-            }
-        ],
-        "reactions": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Delete the reaction from the comment on the destination
-    response = client.delete('/destinations/1/comments/1/reactions', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 200
-    assert response.json == { "message": "Reaction deleted successfully" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-# 39- Test reaction deletion from a non-existent comment on a destination
-def test_delete_reaction_from_non_existent_comment_on_destination(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a destination into the database
-    mongo_db["destinations"].insert_one({
-        "id": 1,
-        "user_id": 1,
-        "userName": "test",
-        "name": "Destination 1",
-        "description": "This is a test destination",
-        "city": "Test City",
-        "country": "Test Country",
-        "media": ["image1.jpg", "image2.jpg"],
-        "comments": [],
-        "reactions": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Delete the reaction from a non-existent comment on the destination
-    response = client.delete('/destinations/1/comments/999/reactions', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Comment not found" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-# 40- Test successful comment on a post
-def test_comment_on_post(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a post into the database
-    mongo_db["posts"].insert_one({
-        "user_id": 1,
-        "id": 1,
-        "userName": "test",
-        "content": "This is a test post",
-        "media": ["image1.jpg", "image2.jpg"],
-        "destinations": [
-            {"id": 1, "name": "Destination 1"},
-            {"id": 2, "name": "Destination 2"}
-        ],
-        "reactions": [],
-        "comments": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Comment on the post
-    response = client.post('/posts/1/comments', data={ "comment": "This is a test comment" }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 200
-    assert response.json == { "message": "Comment added successfully" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-# 41- Test comment on a non-existent post
-def test_comment_on_non_existent_post(client):
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Comment on a non-existent post
-    response = client.post('/posts/999/comments', data={ "comment": "This is a test comment" }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Post not found" }
-
-# 42- Test comment on a post with missing comment
-def test_comment_on_post_missing_comment(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a post into the database
-    mongo_db["posts"].insert_one({
-        "user_id": 1,
-        "id": 1,
-        "userName": "test",
-        "content": "This is a test post",
-        "media": ["image1.jpg", "image2.jpg"],
-        "destinations": [
-            {"id": 1, "name": "Destination 1"},
-            {"id": 2, "name": "Destination 2"}
-        ],
-        "reactions": [],
-        "comments": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Comment on the post with missing comment
-    response = client.post('/posts/1/comments', data={}, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 400
-    assert response.json == { "error": "Comment is required" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-# 43- Test successful comment on a destination
-def test_comment_on_destination(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a destination into the database
-    mongo_db["destinations"].insert_one({
-        "id": 1,
-        "user_id": 1,
-        "userName": "test",
-        "name": "Destination 1",
-        "description": "This is a test destination",
-        "city": "Test City",
-        "country": "Test Country",
-        "media": ["image1.jpg", "image2.jpg"],
-        "comments": [],
-        "reactions": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Comment on the destination
-    response = client.post('/destinations/1/comments', data={ "comment": "This is a test comment" }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 200
-    assert response.json == { "message": "Comment added successfully" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-# 44- Test comment on a non-existent destination
-def test_comment_on_non_existent_destination(client):
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Comment on a non-existent destination
-    response = client.post('/destinations/999/comments', data={ "comment": "This is a test comment" }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Destination not found" }
-
-# 45- Test comment on a destination with missing comment
-def test_comment_on_destination_missing_comment(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a destination into the database
-    mongo_db["destinations"].insert_one({
-        "id": 1,
-        "user_id": 1,
-        "userName": "test",
-        "name": "Destination 1",
-        "description": "This is a test destination",
-        "city": "Test City",
-        "country": "Test Country",
-        "media": ["image1.jpg", "image2.jpg"],
-        "comments": [],
-        "reactions": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Comment on the destination with missing comment
-    response = client.post('/destinations/1/comments', data={}, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 400
-    assert response.json == { "error": "Comment is required" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-# 46- Test successful comment edit on a post
-def test_edit_comment_on_post(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a post with a comment into the database
-    mongo_db["posts"].insert_one({
-        "user_id": 1,
-        "id": 1,
-        "userName": "test",
-        "content": "This is a test post",
-        "media": ["image1.jpg", "image2.jpg"],
-        "destinations": [
-            {"id": 1, "name": "Destination 1"},
-            {"id": 2, "name": "Destination 2"}
-        ],
-        "reactions": [],
-        "comments": [
-            {
-                "comment_id": 1,
-                "user_id": 1,
-                "userName": "test",
-                "comment": "This is a test comment",
-                "reactions": []
-            }
-        ],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Edit the comment on the post
-    response = client.put('/posts/1/comments/1', data={ "comment": "This is an edited test comment" }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 200
-    assert response.json == { "message": "Comment edited successfully" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-# 47- Test comment edit on a non-existent post
-def test_edit_comment_on_non_existent_post(client):
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Edit the comment on a non-existent post
-    response = client.put('/posts/999/comments/1', data={ "comment": "This is an edited test comment" }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Post not found" }
-
-# 48- Test comment edit on a post with missing comment
-def test_edit_comment_on_post_missing_comment(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a post with a comment into the database
-    mongo_db["posts"].insert_one({
-        "user_id": 1,
-        "id": 1,
-        "userName": "test",
-        "content": "This is a test post",
-        "media": ["image1.jpg", "image2.jpg"],
-        "destinations": [
-            {"id": 1, "name": "Destination 1"},
-            {"id": 2, "name": "Destination 2"}
-        ],
-        "reactions": [],
-        "comments": [
-            {
-                "comment_id": 1,
-                "user_id": 1,
-                "userName": "test",
-                "comment": "This is a test comment",
-                "reactions": []
-            }
-        ],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Edit the comment on the post with missing comment
-    response = client.put('/posts/1/comments/1', data={}, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 400
-    assert response.json == { "error": "Comment is required" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-# 49- Test successful comment edit on a destination
-def test_edit_comment_on_destination(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a destination with a comment into the database
-    mongo_db["destinations"].insert_one({
-        "id": 1,
-        "user_id": 1,
-        "userName": "test",
-        "name": "Destination 1",
-        "description": "This is a test destination",
-        "city": "Test City",
-        "country": "Test Country",
-        "media": ["image1.jpg", "image2.jpg"],
-        "comments": [
-            {
-                "comment_id": 1,
-                "user_id": 1,
-                "userName": "test",
-                "comment": "This is a test comment",
-                "reactions": []
-            }
-        ],
-        "reactions": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Edit the comment on the destination
-    response = client.put('/destinations/1/comments/1', data={ "comment": "This is an edited test comment" }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 200
-    assert response.json == { "message": "Comment edited successfully" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
+    mongo_db["destinations"].insert_many([make_destination(1), make_destination(2)], ordered=False)
 
-# 50- Test comment edit on a non-existent destination
-def test_edit_comment_on_non_existent_destination(client):
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Edit the comment on a non-existent destination
-    response = client.put('/destinations/999/comments/1', data={ "comment": "This is an edited test comment" }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Destination not found" }
-
-# 51- Test comment edit on a destination with missing comment
-def test_edit_comment_on_destination_missing_comment(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a destination with a comment into the database
-    mongo_db["destinations"].insert_one({
-        "id": 1,
-        "user_id": 1,
-        "userName": "test",
-        "name": "Destination 1",
-        "description": "This is a test destination",
-        "city": "Test City",
-        "country": "Test Country",
-        "media": ["image1.jpg", "image2.jpg"],
-        "comments": [
-            {
-                "comment_id": 1,
-                "user_id": 1,
-                "userName": "test",
-                "comment": "This is a test comment",
-                "reactions": []
-            }
-        ],
-        "reactions": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Edit the comment on the destination with missing comment
-    response = client.put('/destinations/1/comments/1', data={}, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 400
-    assert response.json == { "error": "Comment is required" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-# 52- Test successful comment deletion from a post
-def test_delete_comment_from_post(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a post with a comment into the database
-    mongo_db["posts"].insert_one({
-        "user_id": 1,
-        "id": 1,
-        "userName": "test",
-        "content": "This is a test post",
-        "media": ["image1.jpg", "image2.jpg"],
-        "destinations": [
-            {"id": 1, "name": "Destination 1"},
-            {"id": 2, "name": "Destination 2"}
-        ],
-        "reactions": [],
-        "comments": [
-            {
-                "comment_id": 1,
-                "user_id": 1,
-                "userName": "test",
-                "comment": "This is a test comment",
-                "reactions": []
-            }
-        ],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Delete the comment from the post
-    response = client.delete('/posts/1/comments/1', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 200
-    assert response.json == { "message": "Comment deleted successfully" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-# 53- Test comment deletion from a non-existent post
-def test_delete_comment_from_non_existent_post(client):
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Delete the comment from a non-existent post
-    response = client.delete('/posts/999/comments/1', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Post not found" }
-
-# 54- Test comment deletion from a non-existent comment on a post
-def test_delete_comment_from_non_existent_comment_on_post(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a post into the database
-    mongo_db["posts"].insert_one({
-        "user_id": 1,
-        "id": 1,
-        "userName": "test",
-        "content": "This is a test post",
-        "media": ["image1.jpg", "image2.jpg"],
-        "destinations": [
-            {"id": 1, "name": "Destination 1"},
-            {"id": 2, "name": "Destination 2"}
-        ],
-        "reactions": [],
-        "comments": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Delete the comment from a non-existent comment on the post
-    response = client.delete('/posts/1/comments/999', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Comment not found" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-# 55- Test successful comment deletion from a destination
-def test_delete_comment_from_destination(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a destination with a comment into the database
-    mongo_db["destinations"].insert_one({
-        "id": 1,
-        "user_id": 1,
-        "userName": "test",
-        "name": "Destination 1",
-        "description": "This is a test destination",
-        "city": "Test City",
-        "country": "Test Country",
-        "media": ["image1.jpg", "image2.jpg"],
-        "comments": [
-            {
-                "comment_id": 1,
-                "user_id": 1,
-                "userName": "test",
-                "comment": "This is a test comment",
-                "reactions": []
-            }
-        ],
-        "reactions": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Delete the comment from the destination
-    response = client.delete('/destinations/1/comments/1', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 200
-    assert response.json == { "message": "Comment deleted successfully" }
-
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-# 56- Test comment deletion from a non-existent destination
-def test_delete_comment_from_non_existent_destination(client):
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Delete the comment from a non-existent destination
-    response = client.delete('/destinations/999/comments/1', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Destination not found" }
-
-# 57- Test comment deletion from a non-existent comment on a destination
-def test_delete_comment_from_non_existent_comment_on_destination(client):
-    # Clean up the database before starting the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a destination into the database
-    mongo_db["destinations"].insert_one({
-        "id": 1,
-        "user_id": 1,
-        "userName": "test",
-        "name": "Destination 1",
-        "description": "This is a test destination",
-        "city": "Test City",
-        "country": "Test Country",
-        "media": ["image1.jpg", "image2.jpg"],
-        "comments": [],
-        "reactions": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
+    # Insert a new post manually
+    mongo_db["posts"].insert_one(make_post(user_id=2, userName="User2"))
 
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    # The post was inserted with id 1
+    post_id = 1
 
-    # Delete the comment from a non-existent comment on the destination
-    response = client.delete('/destinations/1/comments/999', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Comment not found" }
+    # Delete the post
+    response = client.delete(f'/posts/{post_id}', headers=auth_headers)
+    assert_json(response, 401, ERR_UNAUTHORIZED)
+
+# 23 to 31- Test reactions to posts, destinations and their comments
+@pytest.mark.parametrize("collection, document, path, reaction, expected_status, expected_json", [
+    ("posts", make_post(), '/posts/1/reactions', "like", 200, OK_REACTION_ADDED),
+    (None, None, '/posts/999/reactions', "like", 404, ERR_POST_NOT_FOUND),
+    ("posts", make_post(), '/posts/1/reactions', "invalid_reaction", 400, { "error": "Invalid reaction" }),
+    ("posts", make_post(comments=[TEST_COMMENT]), '/posts/1/comments/1/reactions', "like", 200, OK_REACTION_ADDED),
+    ("posts", make_post(), '/posts/1/comments/999/reactions', "like", 404, ERR_COMMENT_NOT_FOUND),
+    ("destinations", make_full_destination(), '/destinations/1/reactions', "like", 200, OK_REACTION_ADDED),
+    (None, None, '/destinations/999/reactions', "like", 404, ERR_DESTINATION_NOT_FOUND),
+    ("destinations", make_full_destination(comments=[TEST_COMMENT]), '/destinations/1/comments/1/reactions', "like", 200, OK_REACTION_ADDED),
+    ("destinations", make_full_destination(), '/destinations/1/comments/999/reactions', "like", 404, ERR_COMMENT_NOT_FOUND),
+], ids=[
+    "post",
+    "non_existent_post",
+    "post_invalid_reaction",
+    "comment_on_post",
+    "non_existent_comment_on_post",
+    "destination",
+    "non_existent_destination",
+    "comment_on_destination",
+    "non_existent_comment_on_destination",
+])
+def test_react(client, auth_headers, collection, document, path, reaction, expected_status, expected_json):
+    # Insert the post or destination the reaction targets
+    if collection:
+        mongo_db[collection].insert_one(copy.deepcopy(document))
+
+    # React
+    response = client.post(path, json={ "reaction": reaction }, headers=auth_headers)
+    assert_json(response, expected_status, expected_json)
+
+# 32 and 36- Test successful reaction deletion from a post or destination
+@pytest.mark.parametrize("resource", RESOURCES)
+def test_delete_reaction(client, auth_headers, resource):
+    # Insert a post or destination with a reaction into the database
+    mongo_db[resource].insert_one(RESOURCES[resource](reactions=[copy.deepcopy(TEST_REACTION)]))
+
+    # Delete the reaction
+    response = client.delete(f'/{resource}/1/reactions', headers=auth_headers)
+    assert_json(response, 200, OK_REACTION_DELETED)
+
+# 17, 21, 33, 37, 41, 44, 47, 50, 53, 56, 63, 66 and 75- Test requests on a non-existent post, destination or trip goal
+@pytest.mark.parametrize("method, path, data, expected_json", [
+    ("put", '/posts/999', {
+        "content": "This is an edited test post",
+        "media": "image3.jpg,image4.jpg",
+        "destinations": "2"
+    }, ERR_POST_NOT_FOUND),
+    ("delete", '/posts/999', None, ERR_POST_NOT_FOUND),
+    ("delete", '/posts/999/reactions', None, ERR_POST_NOT_FOUND),
+    ("delete", '/destinations/999/reactions', None, ERR_DESTINATION_NOT_FOUND),
+    ("post", '/posts/999/comments', { "comment": "This is a test comment" }, ERR_POST_NOT_FOUND),
+    ("post", '/destinations/999/comments', { "comment": "This is a test comment" }, ERR_DESTINATION_NOT_FOUND),
+    ("put", '/posts/999/comments/1', { "comment": "This is an edited test comment" }, ERR_POST_NOT_FOUND),
+    ("put", '/destinations/999/comments/1', { "comment": "This is an edited test comment" }, ERR_DESTINATION_NOT_FOUND),
+    ("delete", '/posts/999/comments/1', None, ERR_POST_NOT_FOUND),
+    ("delete", '/destinations/999/comments/1', None, ERR_DESTINATION_NOT_FOUND),
+    ("put", '/destinations/999', {
+        "name": "Edited Destination",
+        "description": "An edited description",
+        "city": "Edited City",
+        "country": "Edited Country",
+        "media": "image3.jpg,image4.jpg"
+    }, ERR_DESTINATION_NOT_FOUND),
+    ("delete", '/destinations/999', None, ERR_DESTINATION_NOT_FOUND),
+    ("put", '/trip-goals/999', { "destination_ids": "1,2" }, ERR_TRIP_GOAL_NOT_FOUND),
+], ids=[
+    "edit_post",
+    "delete_post",
+    "delete_reaction_from_post",
+    "delete_reaction_from_destination",
+    "comment_on_post",
+    "comment_on_destination",
+    "edit_comment_on_post",
+    "edit_comment_on_destination",
+    "delete_comment_from_post",
+    "delete_comment_from_destination",
+    "edit_destination",
+    "delete_destination",
+    "edit_trip_goal",
+])
+def test_non_existent_resource(client, auth_headers, method, path, data, expected_json):
+    # Send the request to the non-existent post, destination or trip goal
+    response = getattr(client, method)(path, json=data, headers=auth_headers)
+    assert_json(response, 404, expected_json)
+
+# 34 and 38- Test successful reaction deletion from a comment on a post or destination
+@pytest.mark.parametrize("resource", RESOURCES)
+def test_delete_reaction_from_comment(client, auth_headers, resource):
+    # Insert a post or destination with a comment and a reaction into the database
+    mongo_db[resource].insert_one(RESOURCES[resource](comments=[
+        {**TEST_COMMENT, "reactions": [copy.deepcopy(TEST_REACTION)]}
+    ]))
+
+    # Delete the reaction from the comment
+    response = client.delete(f'/{resource}/1/comments/1/reactions', headers=auth_headers)
+    assert_json(response, 200, OK_REACTION_DELETED)
+
+# 35 and 39- Test reaction deletion from a non-existent comment on a post or destination
+@pytest.mark.parametrize("resource", RESOURCES)
+def test_delete_reaction_from_non_existent_comment(client, auth_headers, resource):
+    # Insert a post or destination into the database
+    mongo_db[resource].insert_one(RESOURCES[resource]())
+
+    # Delete the reaction from a non-existent comment
+    response = client.delete(f'/{resource}/1/comments/999/reactions', headers=auth_headers)
+    assert_json(response, 404, ERR_COMMENT_NOT_FOUND)
+
+# 40 and 43- Test successful comment on a post or destination
+@pytest.mark.parametrize("resource", RESOURCES)
+def test_comment(client, auth_headers, resource):
+    # Insert a post or destination into the database
+    mongo_db[resource].insert_one(RESOURCES[resource]())
+
+    # Comment on it
+    response = client.post(f'/{resource}/1/comments', json={ "comment": "This is a test comment" }, headers=auth_headers)
+    assert_json(response, 200, { "message": "Comment added successfully" })
+
+# 42 and 45- Test comment on a post or destination with missing comment
+@pytest.mark.parametrize("resource", RESOURCES)
+def test_comment_missing_comment(client, auth_headers, resource):
+    # Insert a post or destination into the database
+    mongo_db[resource].insert_one(RESOURCES[resource]())
+
+    # Comment on it with missing comment
+    response = client.post(f'/{resource}/1/comments', json={}, headers=auth_headers)
+    assert_json(response, 400, ERR_COMMENT_REQUIRED)
+
+# 46 and 49- Test successful comment edit on a post or destination
+@pytest.mark.parametrize("resource", RESOURCES)
+def test_edit_comment(client, auth_headers, resource):
+    # Insert a post or destination with a comment into the database
+    mongo_db[resource].insert_one(RESOURCES[resource](comments=[copy.deepcopy(TEST_COMMENT)]))
+
+    # Edit the comment
+    response = client.put(f'/{resource}/1/comments/1', json={ "comment": "This is an edited test comment" }, headers=auth_headers)
+    assert_json(response, 200, { "message": "Comment edited successfully" })
+    assert mongo_db[resource].find_one({"id": 1})["comments"] == [{**TEST_COMMENT, "comment": "This is an edited test comment (Editado)"}]
+
+# 48 and 51- Test comment edit on a post or destination with missing comment
+@pytest.mark.parametrize("resource", RESOURCES)
+def test_edit_comment_missing_comment(client, auth_headers, resource):
+    # Insert a post or destination with a comment into the database
+    mongo_db[resource].insert_one(RESOURCES[resource](comments=[copy.deepcopy(TEST_COMMENT)]))
+
+    # Edit the comment with missing comment
+    response = client.put(f'/{resource}/1/comments/1', json={}, headers=auth_headers)
+    assert_json(response, 400, ERR_COMMENT_REQUIRED)
+
+# 52 and 55- Test successful comment deletion from a post or destination
+@pytest.mark.parametrize("resource", RESOURCES)
+def test_delete_comment(client, auth_headers, resource):
+    # Insert a post or destination with a comment into the database
+    mongo_db[resource].insert_one(RESOURCES[resource](comments=[copy.deepcopy(TEST_COMMENT)]))
+
+    # Delete the comment
+    response = client.delete(f'/{resource}/1/comments/1', headers=auth_headers)
+    assert_json(response, 200, { "message": "Comment deleted successfully" })
+    assert mongo_db[resource].find_one({"id": 1})["comments"] == []
+
+# 54 and 57- Test comment deletion from a non-existent comment on a post or destination
+@pytest.mark.parametrize("resource", RESOURCES)
+def test_delete_comment_from_non_existent_comment(client, auth_headers, resource):
+    # Insert a post or destination into the database
+    mongo_db[resource].insert_one(RESOURCES[resource]())
+
+    # Delete a non-existent comment
+    response = client.delete(f'/{resource}/1/comments/999', headers=auth_headers)
+    assert_json(response, 404, ERR_COMMENT_NOT_FOUND)
 
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
-    mongo_db["destinations"].delete_many({})
 # 58- Test get all destinations
-def test_get_destinations(client):
-    # Clean up the database before starting the test
-    mongo_db["destinations"].delete_many({})
-
+def test_get_destinations(client, auth_headers):
     # Insert some destinations into the database
     mongo_db["destinations"].insert_many([
         {"id": 1, "name": "Destination 1", "description": "Description 1", "city": "City 1", "country": "Country 1", "media": ["image1.jpg"]},
         {"id": 2, "name": "Destination 2", "description": "Description 2", "city": "City 2", "country": "Country 2", "media": ["image2.jpg"]}
-    ])
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    ], ordered=False)
 
     # Get all destinations
-    response = client.get('/destinations', headers={ "Authorization": token, "Session-ID": session_id })
+    response = client.get('/destinations', headers=auth_headers)
     assert response.status_code == 200
-    assert len(response.json) == 2
-    assert response.json[0]["name"] == "Destination 1"
-    assert response.json[1]["name"] == "Destination 2"
+    body = response.json
+    assert len(body) == 2
+    assert body[0]["name"] == "Destination 1"
+    assert body[1]["name"] == "Destination 2"
 
-    # Clean up the database after the test
-    mongo_db["destinations"].delete_many({})
 # 59- Test successful destination creation
-def test_add_destination(client):
-    # Clean up the database before starting the test
-    mongo_db["destinations"].delete_many({})
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
+def test_add_destination(client, auth_headers):
     # Add a new destination
-    response = client.post('/destinations', data={
+    response = client.post('/destinations', json={
         "name": "New Destination",
         "description": "A beautiful place",
         "city": "Test City",
         "country": "Test Country",
         "media": "image1.jpg,image2.jpg"
-    }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 200
-    assert response.json == { "message": "Destination added successfully" }
-
-    # Clean up the database after the test
-    mongo_db["destinations"].delete_many({})
+    }, headers=auth_headers)
+    assert_json(response, 200, { "message": "Destination added successfully" })
 
 # 60- Test destination creation with missing fields
-def test_add_destination_missing_fields(client):
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
+def test_add_destination_missing_fields(client, auth_headers):
     # Add a new destination with missing fields
-    response = client.post('/destinations', data={
+    response = client.post('/destinations', json={
         "name": "New Destination",
         "description": "A beautiful place",
         "city": "Test City"
-    }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 400
-    assert response.json == { "error": "All fields are required" }
+    }, headers=auth_headers)
+    assert_json(response, 400, { "error": "All fields are required" })
 
 # 61- Test destination creation with duplicate name
-def test_add_destination_duplicate_name(client):
-    # Clean up the database before starting the test
-    mongo_db["destinations"].delete_many({})
-
+def test_add_destination_duplicate_name(client, auth_headers):
     # Insert a destination into the database
-    mongo_db["destinations"].insert_one({
-        "id": 1,
-        "user_id": 1,
-        "userName": "test",
-        "name": "Duplicate Destination",
-        "description": "This is a test destination",
-        "city": "Test City",
-        "country": "Test Country",
-        "media": ["image1.jpg", "image2.jpg"],
-        "comments": [],
-        "reactions": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    mongo_db["destinations"].insert_one(make_full_destination(name="Duplicate Destination"))
 
     # Add a new destination with a duplicate name
-    response = client.post('/destinations', data={
+    response = client.post('/destinations', json={
         "name": "Duplicate Destination",
         "description": "A beautiful place",
         "city": "Test City",
         "country": "Test Country",
         "media": "image1.jpg,image2.jpg"
-    }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 400
-    assert response.json == { "error": "Destination name must be unique" }
+    }, headers=auth_headers)
+    assert_json(response, 400, { "error": "Destination name must be unique" })
 
-    # Clean up the database after the test
-    mongo_db["destinations"].delete_many({})
 # 62- Test successful destination edit
-def test_edit_destination(client):
-    # Clean up the database before starting the test
-    mongo_db["destinations"].delete_many({})
-
+def test_edit_destination(client, auth_headers):
     # Insert a destination into the database
-    mongo_db["destinations"].insert_one({
-        "id": 1,
-        "user_id": 1,
-        "userName": "test",
-        "name": "Destination 1",
-        "description": "This is a test destination",
-        "city": "Test City",
-        "country": "Test Country",
-        "media": ["image1.jpg", "image2.jpg"],
-        "comments": [],
-        "reactions": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    mongo_db["destinations"].insert_one(make_full_destination())
 
     # Edit the destination
-    response = client.put('/destinations/1', data={
-        "name": "Edited Destination",
-        "description": "An edited description",
-        "city": "Edited City",
-        "country": "Edited Country",
-        "media": "image3.jpg,image4.jpg"
-    }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 200
-    assert response.json == { "message": "Destination edited successfully" }
-
-    # Clean up the database after the test
-    mongo_db["destinations"].delete_many({})
-
-# 63- Test destination edit with non-existent destination
-def test_edit_non_existent_destination(client):
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Edit a non-existent destination
-    response = client.put('/destinations/999', data={
+    response = client.put('/destinations/1', json={
         "name": "Edited Destination",
         "description": "An edited description",
         "city": "Edited City",
         "country": "Edited Country",
         "media": "image3.jpg,image4.jpg"
-    }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Destination not found" }
+    }, headers=auth_headers)
+    assert_json(response, 200, { "message": "Destination edited successfully" })
 
 # 64- Test destination edit by unauthorized user
-def test_edit_unauthorized_destination(client):
-    # Clean up the database before starting the test
-    mongo_db["destinations"].delete_many({})
-
+def test_edit_unauthorized_destination(client, auth_headers):
     # Insert a destination into the database
-    mongo_db["destinations"].insert_one({
-        "id": 1,
-        "user_id": 2,
-        "userName": "User2",
-        "name": "Destination 1",
-        "description": "This is a test destination",
-        "city": "Test City",
-        "country": "Test Country",
-        "media": ["image1.jpg", "image2.jpg"],
-        "comments": [],
-        "reactions": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    mongo_db["destinations"].insert_one(make_full_destination(user_id=2, userName="User2"))
 
     # Edit the destination
-    response = client.put('/destinations/1', data={
+    response = client.put('/destinations/1', json={
         "name": "Edited Destination",
         "description": "An edited description",
         "city": "Edited City",
         "country": "Edited Country",
         "media": "image3.jpg,image4.jpg"
-    }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 401
-    assert response.json == { "error": "Unauthorized" }
+    }, headers=auth_headers)
+    assert_json(response, 401, ERR_UNAUTHORIZED)
 
-    # Clean up the database after the test
-    mongo_db["destinations"].delete_many({})
 # 65- Test successful destination deletion
-def test_delete_destination(client):
-    # Clean up the database before starting the test
-    mongo_db["destinations"].delete_many({})
-
+def test_delete_destination(client, auth_headers):
     # Insert a destination into the database
-    mongo_db["destinations"].insert_one({
-        "id": 1,
-        "user_id": 1,
-        "userName": "test",
-        "name": "Destination 1",
-        "description": "This is a test destination",
-        "city": "Test City",
-        "country": "Test Country",
-        "media": ["image1.jpg", "image2.jpg"],
-        "comments": [],
-        "reactions": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    mongo_db["destinations"].insert_one(make_full_destination())
 
     # Delete the destination
-    response = client.delete('/destinations/1', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 200
-    assert response.json == { "message": "Destination deleted successfully" }
-
-    # Clean up the database after the test
-    mongo_db["destinations"].delete_many({})
-
-# 66- Test destination deletion with non-existent destination
-def test_delete_non_existent_destination(client):
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Delete a non-existent destination
-    response = client.delete('/destinations/999', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Destination not found" }
+    response = client.delete('/destinations/1', headers=auth_headers)
+    assert_json(response, 200, { "message": "Destination deleted successfully" })
 
 # 67- Test destination deletion by unauthorized user
-def test_delete_unauthorized_destination(client):
-    # Clean up the database before starting the test
-    mongo_db["destinations"].delete_many({})
-
+def test_delete_unauthorized_destination(client, auth_headers):
     # Insert a destination into the database
-    mongo_db["destinations"].insert_one({
-        "id": 1,
-        "user_id": 2,
-        "userName": "User2",
-        "name": "Destination 1",
-        "description": "This is a test destination",
-        "city": "Test City",
-        "country": "Test Country",
-        "media": ["image1.jpg", "image2.jpg"],
-        "comments": [],
-        "reactions": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    mongo_db["destinations"].insert_one(make_full_destination(user_id=2, userName="User2"))
 
     # Delete the destination
-    response = client.delete('/destinations/1', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 401
-    assert response.json == { "error": "Unauthorized" }
-
-    # Clean up the database after the test
-    mongo_db["destinations"].delete_many({})
+    response = client.delete('/destinations/1', headers=auth_headers)
+    assert_json(response, 401, ERR_UNAUTHORIZED)
 
 # 68- Test get trip goals of a user
-def test_get_trip_goals(client):
-    # Clean up the database before starting the test
-    mongo_db["tripGoals"].delete_many({})
-
+def test_get_trip_goals(client, auth_headers):
     # Insert a trip goal into the database
-    mongo_db["tripGoals"].insert_one({
-        "id": 1,
-        "user_id": 1,
-        "userName": "test",
-        "destinations": [
-            {"id": 1, "name": "Destination 1"},
-            {"id": 2, "name": "Destination 2"}
-        ],
-        "followers": []
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    mongo_db["tripGoals"].insert_one(make_trip_goal())
 
     # Get trip goals of the user
-    response = client.get('/trip-goals/1', headers={ "Authorization": token, "Session-ID": session_id })
+    response = client.get('/trip-goals/1', headers=auth_headers)
     assert response.status_code == 200
-    assert response.json["user_id"] == 1
-    assert len(response.json["destinations"]) == 2
-
-    # Clean up the database after the test
-    mongo_db["tripGoals"].delete_many({})
+    body = response.json
+    assert body["user_id"] == 1
+    assert len(body["destinations"]) == 2
 
 # 69- Test get trip goals of a non-existent user
-def test_get_trip_goals_non_existent_user(client):
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
+def test_get_trip_goals_non_existent_user(client, auth_headers):
     # Get trip goals of a non-existent user
-    response = client.get('/trip-goals/999', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "User not found" }
-# 70- Test successful trip goal creation
-def test_add_trip_goal(client):
-    # Clean up the database before starting the test
-    mongo_db["tripGoals"].delete_many({})
-    mongo_db["destinations"].delete_many({})
+    response = client.get('/trip-goals/999', headers=auth_headers)
+    assert_json(response, 404, { "error": "User not found" })
 
+# 70- Test successful trip goal creation
+def test_add_trip_goal(client, auth_headers):
     # Insert some destinations into the database
-    mongo_db["destinations"].insert_many([
-        {"id": 1, "name": "Destination 1"},
-        {"id": 2, "name": "Destination 2"}
-    ])
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    mongo_db["destinations"].insert_many([make_destination(1), make_destination(2)], ordered=False)
 
     # Add a new trip goal
-    response = client.post('/trip-goals', data={
+    response = client.post('/trip-goals', json={
         "destination_ids": "1,2"
-    }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 200
-    assert response.json == { "message": "Trip goal added successfully" }
-
-    # Clean up the database after the test
-    mongo_db["tripGoals"].delete_many({})
-    mongo_db["destinations"].delete_many({})
+    }, headers=auth_headers)
+    assert_json(response, 200, { "message": "Trip goal added successfully" })
 
 # 71- Test trip goal creation with missing destination IDs
-def test_add_trip_goal_missing_destination_ids(client):
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
+def test_add_trip_goal_missing_destination_ids(client, auth_headers):
     # Add a new trip goal with missing destination IDs
-    response = client.post('/trip-goals', data={}, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 400
-    assert response.json == { "error": "Destination IDs are required" }
+    response = client.post('/trip-goals', json={}, headers=auth_headers)
+    assert_json(response, 400, ERR_DESTINATION_IDS_REQUIRED)
 
 # 72- Test trip goal creation with invalid destination ID format
-def test_add_trip_goal_invalid_destination_format(client):
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
+def test_add_trip_goal_invalid_destination_format(client, auth_headers):
     # Add a new trip goal with invalid destination ID format
-    response = client.post('/trip-goals', data={
+    response = client.post('/trip-goals', json={
         "destination_ids": "invalid_format"
-    }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 400
-    assert response.json == { "error": "Invalid format for destination IDs" }
+    }, headers=auth_headers)
+    assert_json(response, 400, ERR_DESTINATION_IDS_FORMAT)
 
 # 73- Test trip goal creation with non-existent destination
-def test_add_trip_goal_non_existent_destination(client):
-    # Clean up the database before starting the test
-    mongo_db["tripGoals"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
+def test_add_trip_goal_non_existent_destination(client, auth_headers):
     # Add a new trip goal with non-existent destination
-    response = client.post('/trip-goals', data={
+    response = client.post('/trip-goals', json={
         "destination_ids": "999"
-    }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Destination with id 999 not found" }
+    }, headers=auth_headers)
+    assert_json(response, 404, ERR_DESTINATION_999_NOT_FOUND)
 
-    # Clean up the database after the test
-    mongo_db["tripGoals"].delete_many({})
-    mongo_db["destinations"].delete_many({})
 # 74- Test successful trip goal edit
-def test_edit_trip_goal(client):
-    # Clean up the database before starting the test
-    mongo_db["tripGoals"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
+def test_edit_trip_goal(client, auth_headers):
     # Insert some destinations into the database
-    mongo_db["destinations"].insert_many([
-        {"id": 1, "name": "Destination 1"},
-        {"id": 2, "name": "Destination 2"}
-    ])
+    mongo_db["destinations"].insert_many([make_destination(1), make_destination(2)], ordered=False)
 
     # Insert a trip goal into the database
-    mongo_db["tripGoals"].insert_one({
-        "id": 1,
-        "user_id": 1,
-        "userName": "test",
-        "destinations": [
-            {"id": 1, "name": "Destination 1"}
-        ],
-        "followers": []
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    mongo_db["tripGoals"].insert_one(make_trip_goal(destinations=[make_destination(1)]))
 
     # Edit the trip goal
-    response = client.put('/trip-goals/1', data={
-        "destination_ids": "1,2"
-    }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 200
-    assert response.json == { "message": "Trip goal edited successfully" }
-
-    # Clean up the database after the test
-    mongo_db["tripGoals"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-# 75- Test trip goal edit with non-existent trip goal
-def test_edit_non_existent_trip_goal(client):
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Edit a non-existent trip goal
-    response = client.put('/trip-goals/999', data={
+    response = client.put('/trip-goals/1', json={
         "destination_ids": "1,2"
-    }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Trip goal not found" }
+    }, headers=auth_headers)
+    assert_json(response, 200, { "message": "Trip goal edited successfully" })
 
 # 76- Test trip goal edit by unauthorized user
-def test_edit_unauthorized_trip_goal(client):
-    # Clean up the database before starting the test
-    mongo_db["tripGoals"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
+def test_edit_unauthorized_trip_goal(client, auth_headers):
     # Insert a trip goal into the database
-    mongo_db["tripGoals"].insert_one({
-        "id": 1,
-        "user_id": 2,
-        "userName": "User2",
-        "destinations": [
-            {"id": 1, "name": "Destination 1"}
-        ],
-        "followers": []
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    mongo_db["tripGoals"].insert_one(make_trip_goal(user_id=2, userName="User2", destinations=[make_destination(1)]))
 
     # Edit the trip goal
-    response = client.put('/trip-goals/1', data={
+    response = client.put('/trip-goals/1', json={
         "destination_ids": "1,2"
-    }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 401
-    assert response.json == { "error": "Unauthorized" }
-
-    # Clean up the database after the test
-    mongo_db["tripGoals"].delete_many({})
-    mongo_db["destinations"].delete_many({})
+    }, headers=auth_headers)
+    assert_json(response, 401, ERR_UNAUTHORIZED)
 
 # 77- Test trip goal edit with missing destination IDs
-def test_edit_trip_goal_missing_destination_ids(client):
-    # Clean up the database before starting the test
-    mongo_db["tripGoals"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
+def test_edit_trip_goal_missing_destination_ids(client, auth_headers):
     # Insert a trip goal into the database
-    mongo_db["tripGoals"].insert_one({
-        "id": 1,
-        "user_id": 1,
-        "userName": "test",
-        "destinations": [
-            {"id": 1, "name": "Destination 1"}
-        ],
-        "followers": []
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    mongo_db["tripGoals"].insert_one(make_trip_goal(destinations=[make_destination(1)]))
 
     # Edit the trip goal with missing destination IDs
-    response = client.put('/trip-goals/1', data={}, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 400
-    assert response.json == { "error": "Destination IDs are required" }
-
-    # Clean up the database after the test
-    mongo_db["tripGoals"].delete_many({})
-    mongo_db["destinations"].delete_many({})
+    response = client.put('/trip-goals/1', json={}, headers=auth_headers)
+    assert_json(response, 400, ERR_DESTINATION_IDS_REQUIRED)
 
 # 78- Test trip goal edit with invalid destination ID format
-def test_edit_trip_goal_invalid_destination_format(client):
-    # Clean up the database before starting the test
-    mongo_db["tripGoals"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
+def test_edit_trip_goal_invalid_destination_format(client, auth_headers):
     # Insert a trip goal into the database
-    mongo_db["tripGoals"].insert_one({
-        "id": 1,
-        "user_id": 1,
-        "userName": "test",
-        "destinations": [
-            {"id": 1, "name": "Destination 1"}
-        ],
-        "followers": []
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    mongo_db["tripGoals"].insert_one(make_trip_goal(destinations=[make_destination(1)]))
 
     # Edit the trip goal with invalid destination ID format
-    response = client.put('/trip-goals/1', data={
+    response = client.put('/trip-goals/1', json={
         "destination_ids": "invalid_format"
-    }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 400
-    assert response.json == { "error": "Invalid format for destination IDs" }
-
-    # Clean up the database after the test
-    mongo_db["tripGoals"].delete_many({})
-    mongo_db["destinations"].delete_many({})
+    }, headers=auth_headers)
+    assert_json(response, 400, ERR_DESTINATION_IDS_FORMAT)
 
 # 79- Test trip goal edit with non-existent destination
-def test_edit_trip_goal_non_existent_destination(client):
-    # Clean up the database before starting the test
-    mongo_db["tripGoals"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
+def test_edit_trip_goal_non_existent_destination(client, auth_headers):
     # Insert a trip goal into the database
-    mongo_db["tripGoals"].insert_one({
-        "id": 1,
-        "user_id": 1,
-        "userName": "test",
-        "destinations": [
-            {"id": 1, "name": "Destination 1"}
-        ],
-        "followers": []
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    mongo_db["tripGoals"].insert_one(make_trip_goal(destinations=[make_destination(1)]))
 
     # Edit the trip goal with non-existent destination
-    response = client.put('/trip-goals/1', data={
+    response = client.put('/trip-goals/1', json={
         "destination_ids": "999"
-    }, headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Destination with id 999 not found" }
-
-    # Clean up the database after the test
-    mongo_db["tripGoals"].delete_many({})
-    mongo_db["destinations"].delete_many({})
+    }, headers=auth_headers)
+    assert_json(response, 404, ERR_DESTINATION_999_NOT_FOUND)
 
 # 80- Test successful trip goal deletion
-def test_delete_trip_goal(client):
-    # Clean up the database before starting the test
-    mongo_db["tripGoals"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
+def test_delete_trip_goal(client, auth_headers):
     # Insert a trip goal into the database
-    mongo_db["tripGoals"].insert_one({
-        "id": 1,
-        "user_id": 1,
-        "userName": "test",
-        "destinations": [
-            {"id": 1, "name": "Destination 1"},
-            {"id": 2, "name": "Destination 2"}
-        ],
-        "followers": []
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    mongo_db["tripGoals"].insert_one(make_trip_goal())
 
     # Delete the trip goal
-    response = client.delete('/trip-goals/1', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 200
-    assert response.json == { "message": "Trip goal deleted successfully" }
-
-    # Clean up the database after the test
-    mongo_db["tripGoals"].delete_many({})
-    mongo_db["destinations"].delete_many({})
+    response = client.delete('/trip-goals/1', headers=auth_headers)
+    assert_json(response, 200, { "message": "Trip goal deleted successfully" })
 
 # 81- Test trip goal deletion with non-existent trip goal
-def test_delete_non_existent_trip_goal(client):
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
+def test_delete_non_existent_trip_goal(client, auth_headers):
     # Delete a non-existent trip goal
-    response = client.delete('/trip-goals/999', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Trip goal not found" }
+    response = client.delete('/trip-goals/999', headers=auth_headers)
+    assert_json(response, 404, ERR_TRIP_GOAL_NOT_FOUND)
 
 # 82- Test trip goal deletion by unauthorized user
-def test_delete_unauthorized_trip_goal(client):
-    # Clean up the database before starting the test
-    mongo_db["tripGoals"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
+def test_delete_unauthorized_trip_goal(client, auth_headers):
     # Insert a trip goal into the database
-    mongo_db["tripGoals"].insert_one({
-        "id": 1,
-        "user_id": 2,
-        "userName": "User2",
-        "destinations": [
-            {"id": 1, "name": "Destination 1"},
-            {"id": 2, "name": "Destination 2"}
-        ],
-        "followers": []
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    mongo_db["tripGoals"].insert_one(make_trip_goal(user_id=2, userName="User2"))
 
     # Delete the trip goal
-    response = client.delete('/trip-goals/1', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 401
-    assert response.json == { "error": "Unauthorized" }
+    response = client.delete('/trip-goals/1', headers=auth_headers)
+    assert_json(response, 401, ERR_UNAUTHORIZED)
 
-    # Clean up the database after the test
-    mongo_db["tripGoals"].delete_many({})
-    mongo_db["destinations"].delete_many({})
     
-# 83- Test successful trip goal follow
-def test_follow_trip_goal(client):
-    # Clean up the database before starting the test
-    mongo_db["tripGoals"].delete_many({})
-    mongo_db["destinations"].delete_many({})
 
+# 83, 85, 86 and 88- Test follow and unfollow of a trip goal depending on whether the user already follows it
+@pytest.mark.parametrize("action, followers, expected_status, expected_json", [
+    ("follow", [], 200, { "message": "Trip goal followed successfully" }),
+    ("follow", [TEST_FOLLOWER], 400, { "error": "User already follows this trip goal" }),
+    ("unfollow", [TEST_FOLLOWER], 200, { "message": "Trip goal unfollowed successfully" }),
+    ("unfollow", [], 400, { "error": "User does not follow this trip goal" }),
+], ids=[
+    "follow",
+    "follow_already_followed",
+    "unfollow",
+    "unfollow_not_followed",
+])
+def test_follow_and_unfollow_trip_goal(client, auth_headers, action, followers, expected_status, expected_json):
     # Insert a trip goal into the database
-    mongo_db["tripGoals"].insert_one({
-        "id": 1,
-        "user_id": 1,
-        "userName": "test",
-        "destinations": [
-            {"id": 1, "name": "Destination 1"},
-            {"id": 2, "name": "Destination 2"}
-        ],
-        "followers": []
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    mongo_db["tripGoals"].insert_one(make_trip_goal(followers=copy.deepcopy(followers)))
 
-    # Follow the trip goal
-    response = client.post('/trip-goals/1/follow', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 200
-    assert response.json == { "message": "Trip goal followed successfully" }
-
-    # Clean up the database after the test
-    mongo_db["tripGoals"].delete_many({})
-    mongo_db["destinations"].delete_many({})
+    # Follow or unfollow the trip goal
+    response = client.post(f'/trip-goals/1/{action}', headers=auth_headers)
+    assert_json(response, expected_status, expected_json)
 
 # 84- Test follow non-existent trip goal
-def test_follow_non_existent_trip_goal(client):
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
+def test_follow_non_existent_trip_goal(client, auth_headers):
     # Follow a non-existent trip goal
-    response = client.post('/trip-goals/999/follow', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Trip goal not found" }
-
-# 85- Test follow trip goal already followed
-def test_follow_already_followed_trip_goal(client):
-    # Clean up the database before starting the test
-    mongo_db["tripGoals"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a trip goal into the database
-    mongo_db["tripGoals"].insert_one({
-        "id": 1,
-        "user_id": 1,
-        "userName": "test",
-        "destinations": [
-            {"id": 1, "name": "Destination 1"},
-            {"id": 2, "name": "Destination 2"}
-        ],
-        "followers": [
-            {
-                "user_id": 1,
-                "userName": "test"
-            }
-        ]
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Follow the trip goal again
-    response = client.post('/trip-goals/1/follow', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 400
-    assert response.json == { "error": "User already follows this trip goal" }
-
-    # Clean up the database after the test
-    mongo_db["tripGoals"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-    
-# 86- Test successful trip goal unfollow
-def test_unfollow_trip_goal(client):
-    # Clean up the database before starting the test
-    mongo_db["tripGoals"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a trip goal into the database
-    mongo_db["tripGoals"].insert_one({
-        "id": 1,
-        "user_id": 1,
-        "userName": "test",
-        "destinations": [
-            {"id": 1, "name": "Destination 1"},
-            {"id": 2, "name": "Destination 2"}
-        ],
-        "followers": [
-            {
-                "user_id": 1,
-                "userName": "test"
-            }
-        ]
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Unfollow the trip goal
-    response = client.post('/trip-goals/1/unfollow', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 200
-    assert response.json == { "message": "Trip goal unfollowed successfully" }
-
-    # Clean up the database after the test
-    mongo_db["tripGoals"].delete_many({})
-    mongo_db["destinations"].delete_many({})
+    response = client.post('/trip-goals/999/follow', headers=auth_headers)
+    assert_json(response, 404, ERR_TRIP_GOAL_NOT_FOUND)
 
 # 87- Test unfollow non-existent trip goal
-def test_unfollow_non_existent_trip_goal(client):
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
+def test_unfollow_non_existent_trip_goal(client, auth_headers):
     # Unfollow a non-existent trip goal
-    response = client.post('/trip-goals/999/unfollow', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 404
-    assert response.json == { "error": "Trip goal not found" }
-
-# 88- Test unfollow trip goal not followed
-def test_unfollow_not_followed_trip_goal(client):
-    # Clean up the database before starting the test
-    mongo_db["tripGoals"].delete_many({})
-    mongo_db["destinations"].delete_many({})
-
-    # Insert a trip goal into the database
-    mongo_db["tripGoals"].insert_one({
-        "id": 1,
-        "user_id": 1,
-        "userName": "test",
-        "destinations": [
-            {"id": 1, "name": "Destination 1"},
-            {"id": 2, "name": "Destination 2"}
-        ],
-        "followers": []
-    })
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
-
-    # Unfollow the trip goal not followed
-    response = client.post('/trip-goals/1/unfollow', headers={ "Authorization": token, "Session-ID": session_id })
-    assert response.status_code == 400
-    assert response.json == { "error": "User does not follow this trip goal" }
-
-    # Clean up the database after the test
-    mongo_db["tripGoals"].delete_many({})
-    mongo_db["destinations"].delete_many({})
+    response = client.post('/trip-goals/999/unfollow', headers=auth_headers)
+    assert_json(response, 404, ERR_TRIP_GOAL_NOT_FOUND)
 
 # 89- Test get followed trip goals
-def test_get_followed_trip_goals(client):
-    # Clean up the database before starting the test
-    mongo_db["tripGoals"].delete_many({})
-    pg_conn.cursor().execute("DELETE FROM trip_goals")
-
+def test_get_followed_trip_goals(client, auth_headers):
     # Insert some trip goals into the database
-    mongo_db["tripGoals"].insert_many([
-        {"id": 1, "user_id": 1, "userName": "test", "destinations": [{"id": 1, "name": "Destination 1"}], "followers": []},
-        {"id": 2, "user_id": 2, "userName": "User2", "destinations": [{"id": 2, "name": "Destination 2"}], "followers": []}
-    ])
+    mongo_db["tripGoals"].insert_many(make_two_trip_goals(), ordered=False)
 
-    # Insert followed trip goals into PostgreSQL
-    cursor = pg_conn.cursor()
-    cursor.execute("INSERT INTO trip_goals (trip_goal_id, sub) VALUES (1, 1), (2, 1)")
-    pg_conn.commit()
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    # Replace the followed trip goals in PostgreSQL, in one transaction
+    with pg_cursor() as cursor:
+        cursor.execute("DELETE FROM trip_goals")
+        cursor.execute("INSERT INTO trip_goals (trip_goal_id, sub) VALUES (1, 1), (2, 1)")
 
     # Get followed trip goals
-    response = client.get('/trip-goals/followed', headers={ "Authorization": token, "Session-ID": session_id })
+    response = client.get('/trip-goals/followed', headers=auth_headers)
     assert response.status_code == 200
-    assert len(response.json) == 2
-    assert response.json[0]["id"] == 1
-    assert response.json[1]["id"] == 2
+    body = response.json
+    assert len(body) == 2
+    assert body[0]["id"] == 1
+    assert body[1]["id"] == 2
 
-    # Clean up the database after the test
-    mongo_db["tripGoals"].delete_many({})
-    cursor.execute("DELETE FROM trip_goals")
-    pg_conn.commit()
+    # Clean up PostgreSQL after the test
+    with pg_cursor() as cursor:
+        cursor.execute("DELETE FROM trip_goals")
 
 # 90- Test get followed trip goals with no followed goals
-def test_get_followed_trip_goals_no_followed(client):
-    # Clean up the database before starting the test
-    mongo_db["tripGoals"].delete_many({})
-    pg_conn.cursor().execute("DELETE FROM trip_goals")
+def test_get_followed_trip_goals_no_followed(client, auth_headers):
+    # Clean up PostgreSQL before starting the test
+    with pg_cursor() as cursor:
+        cursor.execute("DELETE FROM trip_goals")
 
     # Insert some trip goals into the database
-    mongo_db["tripGoals"].insert_many([
-        {"id": 1, "user_id": 1, "userName": "test", "destinations": [{"id": 1, "name": "Destination 1"}], "followers": []},
-        {"id": 2, "user_id": 2, "userName": "User2", "destinations": [{"id": 2, "name": "Destination 2"}], "followers": []}
-    ])
-
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    mongo_db["tripGoals"].insert_many(make_two_trip_goals(), ordered=False)
 
     # Get followed trip goals
-    response = client.get('/trip-goals/followed', headers={ "Authorization": token, "Session-ID": session_id })
+    response = client.get('/trip-goals/followed', headers=auth_headers)
     assert response.status_code == 200
     assert len(response.json) == 0
 
-    # Clean up the database after the test
-    mongo_db["tripGoals"].delete_many({})
-    pg_conn.cursor().execute("DELETE FROM trip_goals")
-    pg_conn.commit()
+    # Clean up PostgreSQL after the test
+    with pg_cursor() as cursor:
+        cursor.execute("DELETE FROM trip_goals")
 
 # 91- Test get followed trip goals with invalid session
-def test_get_followed_trip_goals_invalid_session(client):
-    # Clean up the database before starting the test
-    mongo_db["tripGoals"].delete_many({})
-    pg_conn.cursor().execute("DELETE FROM trip_goals")
-
+def test_get_followed_trip_goals_invalid_session(client, auth_headers):
     # Insert some trip goals into the database
-    mongo_db["tripGoals"].insert_many([
-        {"id": 1, "user_id": 1, "userName": "test", "destinations": [{"id": 1, "name": "Destination 1"}], "followers": []},
-        {"id": 2, "user_id": 2, "userName": "User2", "destinations": [{"id": 2, "name": "Destination 2"}], "followers": []}
-    ])
-
-    # Insert followed trip goals into PostgreSQL
-    cursor = pg_conn.cursor()
-    cursor.execute("INSERT INTO trip_goals (trip_goal_id, sub) VALUES (1, 1), (2, 1)")
-    pg_conn.commit()
+    mongo_db["tripGoals"].insert_many(make_two_trip_goals(), ordered=False)
 
-    # Login to get the authorization token
-    login_response = client.post('/login', data={ "username": "test", "password": "test" })
-    token = login_response.json["token"]
+    # Replace the followed trip goals in PostgreSQL, in one transaction
+    with pg_cursor() as cursor:
+        cursor.execute("DELETE FROM trip_goals")
+        cursor.execute("INSERT INTO trip_goals (trip_goal_id, sub) VALUES (1, 1), (2, 1)")
 
     # Get followed trip goals with invalid session
-    response = client.get('/trip-goals/followed', headers={ "Authorization": token, "Session-ID": "" })
-    assert response.status_code == 401
-    assert response.json == { "error": "Session-ID is required" }
-
-    # Clean up the database after the test
-    mongo_db["tripGoals"].delete_many({})
-    cursor.execute("DELETE FROM trip_goals")
-    pg_conn.commit()
+    response = client.get('/trip-goals/followed', headers={ **auth_headers, "Session-ID": "" })
+    assert_json(response, 401, ERR_SESSION_ID_REQUIRED)
+
+    # Clean up PostgreSQL after the test
+    with pg_cursor() as cursor:
+        cursor.execute("DELETE FROM trip_goals")
+
+# 92 and 93- Test caching of popular posts, only the posts with at least X reactions are cached
+@pytest.mark.parametrize("first_post_reactions, first_post_cached", [
+    ([TEST_REACTION, {"user_id": 2, "userName": "test2", "reaction": "love"}], True),
+    ([TEST_REACTION], False),
+], ids=[
+    "popular_post",
+    "no_popular_posts",
+])
+def test_cache_posts(client, auth_headers, first_post_reactions, first_post_cached):
+    # Insert two posts into MongoDB, the second one always has a single reaction
+    mongo_db["posts"].insert_many([
+        make_post(destinations=[make_destination(1)], reactions=copy.deepcopy(first_post_reactions)),
+        make_post(
+            id=2,
+            user_id=2,
+            userName="test2",
+            content="This is another test post",
+            media=["image3.jpg", "image4.jpg"],
+            destinations=[make_destination(2)],
+            reactions=[copy.deepcopy(TEST_REACTION)],
+            created_at="2024-10-12T10:00:00Z"
+        )
+    ], ordered=False)
 
-# 92- Test successful caching of popular posts
+    # Cache popular posts
+    response = client.post('/cache-posts', headers=auth_headers)
+    assert_json(response, 200, OK_POSTS_CACHED)
 
-# 92- Test successful caching of popular posts
-def test_cache_popular_posts(client):
-    # Clean up the database and Redis before starting the test
-    mongo_db["posts"].delete_many({})
-    redis_client.flushall()
+    # Read both posts from Redis in a single round trip
+    cached_post, non_cached_post = redis_client.mget("post:1", "post:2")
 
-    # Insert posts into MongoDB
-    mongo_db["posts"].insert_many([
-        {
-            "user_id": 1,
-            "id": 1,
-            "userName": "test",
-            "content": "This is a test post with 2 reactions",
-            "media": ["image1.jpg", "image2.jpg"],
-            "destinations": [{"id": 1, "name": "Destination 1"}],
-            "reactions": [
-                {"user_id": 1, "userName": "test", "reaction": "like"},
-                {"user_id": 2, "userName": "test2", "reaction": "love"}
-            ],
-            "comments": [],
-            "created_at": "2024-10-12T09:00:00Z"
-        },
-        {
-            "user_id": 2,
-            "id": 2,
-            "userName": "test2",
-            "content": "This is a test post with 1 reaction",
-            "media": ["image3.jpg", "image4.jpg"],
-            "destinations": [{"id": 2, "name": "Destination 2"}],
-            "reactions": [
-                {"user_id": 1, "userName": "test", "reaction": "like"}
-            ],
-            "comments": [],
-            "created_at": "2024-10-12T10:00:00Z"
-        }
-    ])
+    # Only the first post is cached, and only when it is popular
+    if first_post_cached:
+        assert "This is a test post" in cached_post.decode('utf-8')
+    else:
+        assert cached_post is None
+    assert non_cached_post is None
 
-    # Login to get the authorization token
-    login_response = client.post('/login', data={"username": "test", "password": "test"})
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+# 94- Test get post from Redis
+def test_get_post_from_redis(client, auth_headers):
+    # Insert a post into Redis, cached posts are stored without their _id
+    post_data = make_post(destinations=[make_destination(1)])
+    del post_data["_id"]
+    redis_client.set("post:1", orjson.dumps(post_data))
 
-    # Cache popular posts
-    response = client.post('/cache-posts', headers={"Authorization": token, "Session-ID": session_id})
+    # Get the post from Redis
+    response = client.get('/posts/1', headers=auth_headers)
     assert response.status_code == 200
-    assert response.json == {"message": "Posts cached successfully"}
+    assert response.json["content"] == "This is a test post"
 
-    # Verify that the popular post is cached in Redis
-    cached_post = redis_client.get("post:1")
-    assert cached_post is not None
-    assert "This is a test post with 2 reactions" in cached_post.decode('utf-8')
+# 95- Test get post from MongoDB
+def test_get_post_from_mongodb(client, auth_headers):
+    # Insert a post into MongoDB
+    mongo_db["posts"].insert_one(make_post(destinations=[make_destination(1)]))
 
-    # Verify that the non-popular post is not cached in Redis
-    non_cached_post = redis_client.get("post:2")
-    assert non_cached_post is None
+    # Get the post from MongoDB
+    response = client.get('/posts/1', headers=auth_headers)
+    assert response.status_code == 200
+    assert response.json["content"] == "This is a test post"
 
-    # Clean up the database and Redis after the test
-    mongo_db["posts"].delete_many({})
-    redis_client.flushall()
+# 96- Test get non-existent post
+def test_get_non_existent_post(client, auth_headers):
+    # Try to get a non-existent post
+    response = client.get('/posts/999', headers=auth_headers)
+    assert_json(response, 404, ERR_POST_NOT_FOUND)
 
-# 93- Test caching posts with no popular posts
-def test_cache_no_popular_posts(client):
-    # Clean up the database and Redis before starting the test
-    mongo_db["posts"].delete_many({})
-    redis_client.flushall()
+    # The miss is remembered in Redis and served from there on the next request
+    assert redis_client.get("post:999") is not None
+    response = client.get('/posts/999', headers=auth_headers)
+    assert_json(response, 404, ERR_POST_NOT_FOUND)
 
-    # Insert posts into MongoDB
-    mongo_db["posts"].insert_many([
-        {
-            "user_id": 1,
-            "id": 1,
-            "userName": "test",
-            "content": "This is a test post with 1 reaction",
-            "media": ["image1.jpg", "image2.jpg"],
-            "destinations": [{"id": 1, "name": "Destination 1"}],
-            "reactions": [
-                {"user_id": 1, "userName": "test", "reaction": "like"}
-            ],
-            "comments": [],
-            "created_at": "2024-10-12T09:00:00Z"
-        },
-        {
-            "user_id": 2,
-            "id": 2,
-            "userName": "test2",
-            "content": "This is another test post with 1 reaction",
-            "media": ["image3.jpg", "image4.jpg"],
-            "destinations": [{"id": 2, "name": "Destination 2"}],
-            "reactions": [
-                {"user_id": 1, "userName": "test", "reaction": "like"}
-            ],
-            "comments": [],
-            "created_at": "2024-10-12T10:00:00Z"
-        }
-    ])
+# 97- Test get active sessions
+def test_get_active_sessions(client):
+    # Insert some sessions into Redis in a single round trip
+    with redis_client.pipeline(transaction=False) as pipe:
+        pipe.setex("session:1", 36000, "token1")
+        pipe.setex("session:2", 36000, "token2")
+        pipe.execute()
 
     # Login to get the authorization token
-    login_response = client.post('/login', data={"username": "test", "password": "test"})
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    login_response = client.post('/login', data={"username": "user1", "password": "password1"})
+    login = login_response.json
+    token = login["token"]
+    session_id = login["session_id"]
 
-    # Cache popular posts
-    response = client.post('/cache-posts', headers={"Authorization": token, "Session-ID": session_id})
+    # Get active sessions
+    response = client.get('/sessions', headers={"Authorization": token, "Session-ID": session_id})
     assert response.status_code == 200
-    assert response.json == {"message": "Posts cached successfully"}
-
-    # Verify that no posts are cached in Redis
-    cached_post_1 = redis_client.get("post:1")
-    cached_post_2 = redis_client.get("post:2")
-    assert cached_post_1 is None
-    assert cached_post_2 is None
+    body = response.json
+    assert "session:1" in body
+    assert "session:2" in body
 
-    # Clean up the database and Redis after the test
-    mongo_db["posts"].delete_many({})
-    redis_client.flushall()
+    # Remove only the sessions of this test, the auth_headers session is shared by the whole run
+    redis_client.delete("session:1", "session:2", f"session:{session_id}")
 
-# 94- Test get post from Redis
-def test_get_post_from_redis(client):
-    # Clean up the database and Redis before starting the test
-    mongo_db["posts"].delete_many({})
-    redis_client.flushall()
-
-    # Insert a post into Redis
-    post_data = {
-        "user_id": 1,
-        "id": 1,
-        "userName": "test",
-        "content": "This is a test post",
-        "media": ["image1.jpg", "image2.jpg"],
-        "destinations": [{"id": 1, "name": "Destination 1"}],
-        "reactions": [],
-        "comments": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    }
-    with app.app_context():
-        redis_client.set(f"post:1", jsonify(post_data).get_data(as_text=True))
+# 98- Test reaction to a post with the same reaction twice and changing it
+def test_react_to_post_same_and_changed_reaction(client, auth_headers):
+    # Insert a post into the database
+    mongo_db["posts"].insert_one(make_post(reactions=[copy.deepcopy(TEST_REACTION)]))
 
-    # Login to get the authorization token
-    login_response = client.post('/login', data={"username": "test", "password": "test"})
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    # React with the same reaction
+    response = client.post('/posts/1/reactions', json={ "reaction": "like" }, headers=auth_headers)
+    assert_json(response, 400, { "error": "User has already reacted with the same reaction" })
 
-    # Get the post from Redis
-    response = client.get('/posts/1', headers={"Authorization": token, "Session-ID": session_id})
+    # Change the reaction
+    response = client.post('/posts/1/reactions', json={ "reaction": "love" }, headers=auth_headers)
     assert response.status_code == 200
-    assert response.json["content"] == "This is a test post"
+    assert mongo_db["posts"].find_one({"id": 1})["reactions"] == [{"user_id": 1, "userName": "test", "reaction": "love"}]
 
-    # Clean up the database and Redis after the test
-    redis_client.flushall()
+# 99- Test get several posts by id from Redis and MongoDB
+def test_get_posts_by_ids(client, auth_headers):
+    # Insert one post into Redis and another into MongoDB
+    redis_client.set("post:1", orjson.dumps({"id": 1, "content": "Cached post"}))
+    mongo_db["posts"].insert_one(make_post(id=2, content="Stored post", media=[], destinations=[]))
 
-# 95- Test get post from MongoDB
-def test_get_post_from_mongodb(client):
-    # Clean up the database and Redis before starting the test
-    mongo_db["posts"].delete_many({})
-    redis_client.flushall()
+    # Get both posts plus a non-existent one
+    response = client.get('/posts?ids=2,1,999', headers=auth_headers)
+    assert response.status_code == 200
+    assert [post["content"] for post in response.json] == ["Stored post", "Cached post"]
 
-    # Insert a post into MongoDB
-    mongo_db["posts"].insert_one({
-        "user_id": 1,
-        "id": 1,
-        "userName": "test",
-        "content": "This is a test post",
-        "media": ["image1.jpg", "image2.jpg"],
-        "destinations": [{"id": 1, "name": "Destination 1"}],
-        "reactions": [],
-        "comments": [],
-        "created_at": "2024-10-12T09:00:00Z"
-    })
+    # Invalid ids
+    response = client.get('/posts?ids=1,abc', headers=auth_headers)
+    assert_json(response, 400, {"error": "Invalid format for post IDs"})
 
-    # Login to get the authorization token
-    login_response = client.post('/login', data={"username": "test", "password": "test"})
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+# 100- Test follow and unfollow keep the cached trip goal up to date
+def test_follow_trip_goal_write_through_cache(client, auth_headers):
+    # Clean up PostgreSQL before starting the test
+    with pg_cursor() as cursor:
+        cursor.execute("DELETE FROM trip_goals")
 
-    # Get the post from MongoDB
-    response = client.get('/posts/1', headers={"Authorization": token, "Session-ID": session_id})
+    # Insert a trip goal into the database
+    mongo_db["tripGoals"].insert_one(make_trip_goal(user_id=2, userName="User2", destinations=[make_destination(1)]))
+
+    # Follow the trip goal and check the cached copy
+    response = client.post('/trip-goals/1/follow', headers=auth_headers)
     assert response.status_code == 200
-    assert response.json["content"] == "This is a test post"
+    cached_trip_goal = orjson.loads(redis_client.get("trip_goal:1"))
+    assert len(cached_trip_goal["followers"]) == 1
+    assert "user_id" not in cached_trip_goal["followers"][0]
 
-    # Clean up the database after the test
-    mongo_db["posts"].delete_many({})
+    # The followed trip goals are served from the cache
+    response = client.get('/trip-goals/followed', headers=auth_headers)
+    assert_json(response, 200, [cached_trip_goal])
 
-# 96- Test get non-existent post
-def test_get_non_existent_post(client):
-    # Clean up the database and Redis before starting the test
-    mongo_db["posts"].delete_many({})
-    redis_client.flushall()
+    # Unfollow the trip goal and check the cached copy
+    response = client.post('/trip-goals/1/unfollow', headers=auth_headers)
+    assert response.status_code == 200
+    assert orjson.loads(redis_client.get("trip_goal:1"))["followers"] == []
+
+    # Clean up PostgreSQL after the test
+    with pg_cursor() as cursor:
+        cursor.execute("DELETE FROM trip_goals")
+
+# 101- Test reacting to a post refreshes the cached popular post
+def test_react_to_post_refreshes_cached_post(client, auth_headers):
+    # Insert a post one reaction away from being popular
+    mongo_db["posts"].insert_one(make_post(
+        user_id=2,
+        userName="test2",
+        media=[],
+        destinations=[],
+        reactions=[{"user_id": 2, "userName": "test2", "reaction": "like"}]
+    ))
+
+    # The second reaction makes the post popular and caches it
+    response = client.post('/posts/1/reactions', json={ "reaction": "love" }, headers=auth_headers)
+    assert response.status_code == 200
+    assert len(orjson.loads(redis_client.get("post:1"))["reactions"]) == 2
 
-    # Login to get the authorization token
-    login_response = client.post('/login', data={"username": "test", "password": "test"})
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    # Removing the reaction takes it out of the cache
+    response = client.delete('/posts/1/reactions', headers=auth_headers)
+    assert response.status_code == 200
+    assert redis_client.get("post:1") is None
+
+# 102- Benchmark login, the request path around the hash check (conftest lowers the bcrypt cost, so not the cost itself)
+@pytest.mark.benchmark(group="auth", min_rounds=100, disable_gc=True)
+def test_login_benchmark(client, benchmark):
+    session_keys = []
+
+    def login():
+        response = client.post('/login', data={ "username": "test", "password": "test" })
+        if response.status_code == 200:
+            session_keys.append(f"session:{response.json['session_id']}")
+        return response
+
+    # Every round creates a session, they are removed so they do not pile up in the Redis db
+    try:
+        response = benchmark(login)
+        assert response.status_code == 200
+    finally:
+        if session_keys:
+            redis_client.delete(*session_keys)
+
+# 103- Benchmark adding a comment to a destination and listing the destinations
+@pytest.mark.benchmark(group="destinations", min_rounds=100, disable_gc=True)
+def test_destinations_benchmark(client, auth_headers, benchmark):
+    # Insert a destination into the database
+    mongo_db["destinations"].insert_one(make_full_destination())
 
-    # Try to get a non-existent post
-    response = client.get('/posts/999', headers={"Authorization": token, "Session-ID": session_id})
-    assert response.status_code == 404
-    assert response.json == {"error": "Post not found"}
+    def comment_and_list():
+        client.post('/destinations/1/comments', json={ "comment": "This is a test comment" }, headers=auth_headers)
+        return client.get('/destinations', headers=auth_headers)
 
-    # Clean up the database and Redis after the test
-    redis_client.flushall()
+    response = benchmark(comment_and_list)
+    assert response.status_code == 200
 
-# 97- Test get active sessions
-def test_get_active_sessions(client):
-    # Clean up Redis before starting the test
-    redis_client.flushall()
+# 104- Test JSON bodies that are not an object or carry fields that are not text get the usual 400 responses
+@pytest.mark.parametrize("path, body, expected_json", [
+    ('/signup', ["test", "test"], ERR_CREDENTIALS_REQUIRED),
+    ('/posts', { "content": "This is a test post", "media": ["image1.jpg"], "destinations": "1" }, { "error": "Content, destinations, and media are required" }),
+    ('/destinations', { "name": { "en": "Destination" }, "description": "A place", "city": "City", "country": "Country", "media": "image1.jpg" }, { "error": "All fields are required" }),
+    ('/trip-goals', { "destination_ids": [1, 2] }, ERR_DESTINATION_IDS_REQUIRED),
+    ('/trip-goals', { "destination_ids": 1.5 }, ERR_DESTINATION_IDS_FORMAT),
+    ('/posts/1/comments', "This is a test comment", ERR_COMMENT_REQUIRED),
+], ids=[
+    "list_body",
+    "list_field",
+    "object_field",
+    "list_of_numbers_field",
+    "float_field",
+    "string_body",
+])
+def test_invalid_json_body(client, auth_headers, path, body, expected_json):
+    response = client.post(path, json=body, headers=auth_headers)
+    assert_json(response, 400, expected_json)
+
+# 105- Test a counter behind the existing ids is synced and the insert retried with a free id
+def test_add_with_lagging_counter(client, auth_headers):
+    mongo_db["destinations"].insert_one(make_full_destination())
+    mongo_db["tripGoals"].insert_one(make_trip_goal())
+    mongo_db["counters"].update_many({"_id": {"$in": ["destinations", "tripGoals"]}}, {"$set": {"seq": 0}})
+
+    destination = { "name": "New Destination", "description": "A place", "city": "City", "country": "Country", "media": "image1.jpg" }
+    response = client.post('/destinations', json=destination, headers=auth_headers)
+    assert_json(response, 200, { "message": "Destination added successfully" })
+    assert mongo_db["destinations"].find_one({"name": "New Destination"})["id"] == 2
+
+    response = client.post('/trip-goals', json={ "destination_ids": "1" }, headers=auth_headers)
+    assert_json(response, 200, { "message": "Trip goal added successfully" })
+    assert mongo_db["tripGoals"].count_documents({"id": 2}) == 1
+
+# 106- Test editing a cached popular post refreshes its copy in Redis
+def test_edit_post_refreshes_cached_post(client, auth_headers):
+    # Insert a popular post and cache it
+    mongo_db["posts"].insert_one(make_post(reactions=[copy.deepcopy(TEST_REACTION), {"user_id": 2, "userName": "test2", "reaction": "love"}]))
+    response = client.post('/cache-posts', headers=auth_headers)
+    assert_json(response, 200, OK_POSTS_CACHED)
+
+    # The edit is served from the cache right away
+    response = client.put('/posts/1', json={ "content": "This is an edited test post" }, headers=auth_headers)
+    assert_json(response, 200, { "message": "Post edited successfully" })
+    assert orjson.loads(redis_client.get("post:1"))["content"] == "This is an edited test post (Editado)"
+
+# 107- Test a plaintext password from before bcrypt logs in once and is rehashed
+def test_login_rehashes_plaintext_password(client):
+    username = f"plain_{uuid.uuid4().hex[:8]}"
+    with pg_cursor() as cursor:
+        cursor.execute("INSERT INTO users (username, password) VALUES (%s, %s)", (username, "secret"))
+
+    try:
+        response = client.post('/login', data={ "username": username, "password": "secret" })
+        assert response.status_code == 200
+        redis_client.delete(f"session:{response.json['session_id']}")
+
+        # The stored password is now a bcrypt hash, and it still matches
+        with pg_cursor() as cursor:
+            cursor.execute("SELECT password FROM users WHERE username = %s", (username,))
+            assert cursor.fetchone()[0].startswith("$2")
+        response = client.post('/login', data={ "username": username, "password": "secret" })
+        assert response.status_code == 200
+        redis_client.delete(f"session:{response.json['session_id']}")
+    finally:
+        with pg_cursor() as cursor:
+            cursor.execute("DELETE FROM users WHERE username = %s", (username,))
+
+# 108- Test a session stored before the sub was its value is invalid and removed
+def test_check_session_legacy_value(client):
+    session_id = f"legacy_{uuid.uuid4().hex}"
+    redis_client.setex(f"session:{session_id}", 36000, STATIC_TOKEN)
+
+    response = client.post('/check-session', headers={ "Authorization": STATIC_TOKEN, "Session-ID": session_id })
+    assert_json(response, 401, { "error": "Session is invalid" })
+    assert redis_client.get(f"session:{session_id}") is None
+
+# 109- Test commenting on a cached popular post refreshes its copy in Redis
+def test_comment_refreshes_cached_post(client, auth_headers):
+    # Insert a popular post and cache it
+    mongo_db["posts"].insert_one(make_post(reactions=[copy.deepcopy(TEST_REACTION), {"user_id": 2, "userName": "test2", "reaction": "love"}]))
+    response = client.post('/cache-posts', headers=auth_headers)
+    assert_json(response, 200, OK_POSTS_CACHED)
+
+    # Add, edit and delete a comment, the cached copy follows each write
+    response = client.post('/posts/1/comments', json={ "comment": "This is a test comment" }, headers=auth_headers)
+    assert response.status_code == 200
+    comments = orjson.loads(redis_client.get("post:1"))["comments"]
+    assert [comment["comment"] for comment in comments] == ["This is a test comment"]
 
-    # Insert some sessions into Redis
-    redis_client.setex("session:1", 36000, "token1")
-    redis_client.setex("session:2", 36000, "token2")
+    comment_id = comments[0]["comment_id"]
+    response = client.put(f'/posts/1/comments/{comment_id}', json={ "comment": "Edited comment" }, headers=auth_headers)
+    assert response.status_code == 200
+    assert orjson.loads(redis_client.get("post:1"))["comments"][0]["comment"] == "Edited comment (Editado)"
 
-    # Login to get the authorization token
-    login_response = client.post('/login', data={"username": "user1", "password": "password1"})
-    token = login_response.json["token"]
-    session_id = login_response.json["session_id"]
+    response = client.delete(f'/posts/1/comments/{comment_id}', headers=auth_headers)
+    assert response.status_code == 200
+    assert orjson.loads(redis_client.get("post:1"))["comments"] == []
+
+# 110- Test editing or deleting another user's comment on a post or destination is not found and leaves it untouched
+@pytest.mark.parametrize("resource", RESOURCES)
+def test_edit_and_delete_other_users_comment(client, auth_headers, resource):
+    # Insert a post or destination with a comment of another user
+    other_comment = {**TEST_COMMENT, "user_id": 2, "userName": "User2"}
+    mongo_db[resource].insert_one(RESOURCES[resource](comments=[copy.deepcopy(other_comment)]))
+
+    response = client.put(f'/{resource}/1/comments/1', json={ "comment": "This is an edited test comment" }, headers=auth_headers)
+    assert_json(response, 404, ERR_COMMENT_NOT_FOUND)
+    response = client.delete(f'/{resource}/1/comments/1', headers=auth_headers)
+    assert_json(response, 404, ERR_COMMENT_NOT_FOUND)
+
+    assert mongo_db[resource].find_one({"id": 1})["comments"] == [other_comment]
+
+# 111- Test a write invalidates the cached listing, the second GET shows the new post or destination
+@pytest.mark.parametrize("resource, body", [
+    ("posts", { "content": "This is a test post", "media": "image1.jpg", "destinations": "1" }),
+    ("destinations", { "name": "New Destination", "description": "A place", "city": "City", "country": "Country", "media": "image1.jpg" }),
+], ids=[
+    "posts",
+    "destinations",
+])
+def test_write_invalidates_cached_listing(client, auth_headers, resource, body):
+    mongo_db["destinations"].insert_one(make_full_destination())
+
+    # The first GET caches the listing
+    response = client.get(f'/{resource}', headers=auth_headers)
+    assert response.status_code == 200
+    before = len(response.json)
+    assert redis_client.get(f"cache:{resource}") is not None
 
-    # Get active sessions
-    response = client.get('/sessions', headers={"Authorization": token, "Session-ID": session_id})
+    response = client.post(f'/{resource}', json=body, headers=auth_headers)
     assert response.status_code == 200
-    assert "session:1" in response.json
-    assert "session:2" in response.json
 
-    # Clean up Redis after the test
-    redis_client.flushall()
+    # The listing is read again instead of served from the stale cache
+    response = client.get(f'/{resource}', headers=auth_headers)
+    assert response.status_code == 200
+    assert len(response.json) == before + 1
@@ -10,6 +10,9 @@ db.createCollection('destinations');
 // Crear la colección para Objetivos de Viajes
 db.createCollection('tripGoals');
 
+// Crear la colección para los contadores de ids (secuencias atómicas)
+db.createCollection('counters');
+
 // Insertar datos de ejemplo
 
 // post
@@ -115,4 +118,12 @@ db.tripGoals.insertOne({
             userName: "User4"
         }
     ]
-});
\ No newline at end of file
+});
+
+// Contadores de ids, inician en el último id de los datos de ejemplo
+db.counters.insertMany([
+    { _id: "destinations", seq: 1 },
+    { _id: "tripGoals", seq: 1 },
+    { _id: "posts:1:comments", seq: 1 },
+    { _id: "destinations:1:comments", seq: 1 }
+]);
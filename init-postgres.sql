@@ -1,10 +1,13 @@
 -- Este archivo se encarga de crear la base de datos y las tablas necesarias para el proyecto
 
+-- Extensión para generar los hashes bcrypt de los usuarios de prueba
+CREATE EXTENSION IF NOT EXISTS pgcrypto;
+
 -- Tabla de usuarios, contiene el id del usuario, el nombre de usuario y la fecha de creación.
 CREATE TABLE users (
     sub SERIAL PRIMARY KEY,
     username VARCHAR(50) NOT NULL,
-    password VARCHAR(50) NOT NULL,
+    password VARCHAR(60) NOT NULL, -- Hash bcrypt de la contraseña
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
@@ -24,12 +27,15 @@ CREATE TABLE trip_goals (
     FOREIGN KEY (sub) REFERENCES users(sub)
 );
 
+-- Índice para obtener los trip goals seguidos por un usuario, único para no duplicar seguimientos
+CREATE UNIQUE INDEX idx_trip_goals_sub_trip_goal_id ON trip_goals(sub, trip_goal_id);
+
 
 -- Inserts de prueba para la tabla de usuarios
-INSERT INTO users (username, password) VALUES ('user1', 'password1');
-INSERT INTO users (username, password) VALUES ('user2', 'password2');
-INSERT INTO users (username, password) VALUES ('user3', 'password3');
-INSERT INTO users (username, password) VALUES ('user4', 'password4');
+INSERT INTO users (username, password) VALUES ('user1', crypt('password1', gen_salt('bf', 12)));
+INSERT INTO users (username, password) VALUES ('user2', crypt('password2', gen_salt('bf', 12)));
+INSERT INTO users (username, password) VALUES ('user3', crypt('password3', gen_salt('bf', 12)));
+INSERT INTO users (username, password) VALUES ('user4', crypt('password4', gen_salt('bf', 12)));
 
 -- Inserts de prueba para la tabla de posts
 INSERT INTO posts (sub) VALUES (1);